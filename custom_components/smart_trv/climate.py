@@ -1,9 +1,12 @@
 """Climate platform for Smart TRV Controller."""
 from __future__ import annotations
 
+import asyncio
 import logging
 import math
 import time
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
 from typing import Any
 
 from homeassistant.components.climate import (ClimateEntity, ClimateEntityFeature, HVACAction, HVACMode, )
@@ -26,11 +29,62 @@ from .const import (ATTR_ROOM_TEMPERATURE, ATTR_TRV_ENTITIES, ATTR_VALVE_POSITIO
                     DEFAULT_IMC_PROCESS_GAIN, DEFAULT_IMC_DEAD_TIME, DEFAULT_IMC_TIME_CONSTANT, DEFAULT_IMC_LAMBDA,  # Diagnostics and defaults
                     ATTR_DESIRED_VALVE_POSITION, ATTR_ERROR_C, ATTR_ERROR_NORM, ATTR_U_PI, ATTR_U_I, ATTR_U_FF, ATTR_U_TOTAL, ATTR_FLOW_FILTERED,
                     ATTR_OUTDOOR_FILTERED, ATTR_IMC_KC, ATTR_IMC_KI, ATTR_WINDOW_OPEN, ATTR_ACTUAL_VALVE_POSITION,  # Steady-state defaults and other defaults
-                    DEFAULT_STEADY_DEADBAND_C, DEFAULT_DECAY_TAU_S, DEFAULT_NAME, MIN_TEMP_RANGE_C, WINDOW_CHECK_MIN_INTERVAL_S, DEFAULT_BOOST_DURATION_S,
-                    CONF_WINDOW_OPEN_THRESHOLD_PER_MIN, CONF_WINDOW_OPEN_DURATION, DEFAULT_WINDOW_OPEN_THRESHOLD_PER_MIN, DEFAULT_WINDOW_OPEN_DURATION, )
+                    DEFAULT_STEADY_DEADBAND_C, DEFAULT_DECAY_TAU_S, DEFAULT_NAME, MIN_TEMP_RANGE_C, WINDOW_CHECK_MIN_INTERVAL_S, WINDOW_RATE_FILTER_TAU_S, DEFAULT_BOOST_DURATION_S,
+                    CONF_WINDOW_OPEN_THRESHOLD_PER_MIN, CONF_WINDOW_OPEN_DURATION, DEFAULT_WINDOW_OPEN_THRESHOLD_PER_MIN, DEFAULT_WINDOW_OPEN_DURATION,
+                    SENSOR_TEMP_CHANGE_EPSILON_C, SENSOR_FF_CHANGE_EPSILON_K, ACTUAL_VALVE_POLL_MIN_INTERVAL_S,
+                    CONTROL_MIN_INTERVAL_S, FF_ALPHA_DT_REL_TOL, )
 
 _LOGGER = logging.getLogger(__name__)
 
+# Reciprocal of the full-open valve position (0..255 -> 0..1 scaling)
+_INV_VALVE_OPEN = 1.0 / float(VALVE_OPEN_POSITION)
+
+# Valve command granularity, resolved once (VALVE_MIN_STEP <= 1 disables snapping)
+_VALVE_SNAP_STEP = max(1, int(VALVE_MIN_STEP))
+
+# States that carry no usable sensor reading
+_BAD_STATES = frozenset({STATE_UNAVAILABLE, STATE_UNKNOWN})
+
+# Optional diagnostics attributes, in the order of the values built in extra_state_attributes
+_DIAG_KEYS = (ATTR_ERROR_C, ATTR_ERROR_NORM, ATTR_U_PI, ATTR_U_I, ATTR_U_FF, ATTR_U_TOTAL, ATTR_FLOW_FILTERED, ATTR_OUTDOOR_FILTERED)
+
+# HVAC modes that may be restored from the last known state
+_RESTORABLE_HVAC_MODES = frozenset({HVACMode.OFF.value, HVACMode.HEAT.value, HVACMode.AUTO.value})
+
+
+def _valve_entity_id(trv_entity_id: str) -> str:
+    """Return the companion valve-position number entity id for a TRV climate entity."""
+    return trv_entity_id.replace("climate.", "number.") + "_valve_position"
+
+
+def _round2(v: Any) -> Any:
+    """Round numeric diagnostics to two decimals; pass through None, bools and non-numbers."""
+    if v is None or isinstance(v, bool) or not isinstance(v, (int, float)):
+        return v
+    return round(float(v), 2)
+
+
+def _clamp_valve(v: int) -> int:
+    """Clamp an integer valve position to [VALVE_CLOSED_POSITION, VALVE_OPEN_POSITION]."""
+    return VALVE_CLOSED_POSITION if v < VALVE_CLOSED_POSITION else VALVE_OPEN_POSITION if v > VALVE_OPEN_POSITION else v
+
+
+def _value_changed(old: float | None, new: float | None, eps: float) -> bool:
+    """Return True if a cached reading changed by at least eps (or became/stopped being available)."""
+    if old is None or new is None:
+        return old is not new
+    return abs(new - old) >= eps
+
+
+def _state_to_float(state: Any) -> float | None:
+    """Parse a numeric state object; None when missing, unavailable/unknown or non-numeric."""
+    if state is None or (raw := state.state) in _BAD_STATES:
+        return None
+    try:
+        return float(raw)
+    except (TypeError, ValueError):
+        return None
+
 
 async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry, async_add_entities: AddEntitiesCallback, ) -> None:
     """Set up the Smart TRV Controller climate entity from a config entry."""
@@ -39,6 +93,99 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry, asyn
     async_add_entities([SmartTRVClimate(hass, config_entry.entry_id, config)], True, )
 
 
+@dataclass(frozen=True, slots=True)
+class _TRVConfig:
+    """Typed, validated configuration snapshot of one Smart TRV entry."""
+
+    name: str
+    temperature_sensor: str | None
+    trv_entities: tuple[str, ...]
+    min_temp: float
+    max_temp: float
+    target_temp: float
+    precision: float
+    outdoor_sensor: str | None
+    boiler_flow_sensor: str | None
+    ff_k_flow: float
+    ff_k_outdoor: float
+    ff_tflow_ref: float
+    ff_tout_ref: float
+    ff_enable_smoothing: bool
+    ff_flow_tau_s: float
+    ff_outdoor_tau_s: float
+    ff_flow_deadband_k: float
+    ff_outdoor_deadband_k: float
+    window_threshold_per_min: float
+    window_duration: float
+    imc_process_gain: float
+    imc_time_constant: float
+    imc_dead_time: float
+    imc_lambda: float
+    # Derived IMC tuning
+    temp_range: float
+    kc: float
+    ki: float
+
+    @classmethod
+    def from_mapping(cls, config: Mapping[str, Any]) -> _TRVConfig:
+        """Parse a config entry mapping, applying defaults and validation.
+
+        Swaps inverted min/max temperatures, clamps the target into range and raises
+        ValueError for IMC parameters that cannot yield a valid controller.
+        """
+        min_temp = float(config.get(CONF_MIN_TEMP, DEFAULT_MIN_TEMP))
+        max_temp = float(config.get(CONF_MAX_TEMP, DEFAULT_MAX_TEMP))
+        if min_temp >= max_temp:
+            _LOGGER.error("Invalid configuration: min_temp (%.1f) >= max_temp (%.1f). Swapping them.", min_temp, max_temp)
+            min_temp, max_temp = max_temp, min_temp
+        # Clamp target temp to valid range
+        target_temp = max(min_temp, min(max_temp, float(config.get(CONF_TARGET_TEMP, DEFAULT_TARGET_TEMP))))
+
+        window_threshold = abs(float(config.get(CONF_WINDOW_OPEN_THRESHOLD_PER_MIN, DEFAULT_WINDOW_OPEN_THRESHOLD_PER_MIN)))
+        if window_threshold == 0:
+            window_threshold = DEFAULT_WINDOW_OPEN_THRESHOLD_PER_MIN
+
+        # IMC parameters are mandatory; fall back to sensible defaults
+        kp_proc = float(config.get(CONF_IMC_PROCESS_GAIN, DEFAULT_IMC_PROCESS_GAIN))
+        tau = float(config.get(CONF_IMC_TIME_CONSTANT, DEFAULT_IMC_TIME_CONSTANT))
+        theta = float(config.get(CONF_IMC_DEAD_TIME, DEFAULT_IMC_DEAD_TIME) or 0.0)
+        lam_raw = config.get(CONF_IMC_LAMBDA)
+        lam_f = float(lam_raw) if lam_raw is not None else float(DEFAULT_IMC_LAMBDA)
+        if kp_proc <= 0 or tau <= 0 or lam_f <= 0 or (lam_f + theta) <= 0:
+            raise ValueError(f"Invalid IMC parameters: Kp_proc={kp_proc}, tau={tau}, theta={theta}, lambda={lam_f}")
+        temp_range = max(MIN_TEMP_RANGE_C, max_temp - min_temp)
+
+        return cls(
+            name=config.get(CONF_NAME, DEFAULT_NAME),
+            temperature_sensor=config.get(CONF_TEMPERATURE_SENSOR),
+            trv_entities=tuple(config.get(CONF_TRV_ENTITIES, ())),
+            min_temp=min_temp,
+            max_temp=max_temp,
+            target_temp=target_temp,
+            precision=float(config.get(CONF_PRECISION, DEFAULT_PRECISION)),
+            outdoor_sensor=config.get(CONF_OUTDOOR_TEMPERATURE_SENSOR),
+            boiler_flow_sensor=config.get(CONF_BOILER_FLOW_TEMPERATURE_SENSOR),
+            ff_k_flow=float(config.get(CONF_FF_K_FLOW, DEFAULT_FF_K_FLOW)),
+            ff_k_outdoor=float(config.get(CONF_FF_K_OUTDOOR, DEFAULT_FF_K_OUTDOOR)),
+            ff_tflow_ref=float(config.get(CONF_FF_TFLOW_REF, DEFAULT_FF_TFLOW_REF)),
+            ff_tout_ref=float(config.get(CONF_FF_TOUT_REF, DEFAULT_FF_TOUT_REF)),
+            ff_enable_smoothing=bool(config.get(CONF_FF_ENABLE_SMOOTHING, DEFAULT_FF_ENABLE_SMOOTHING)),
+            ff_flow_tau_s=float(config.get(CONF_FF_FLOW_FILTER_TAU_S, DEFAULT_FF_FLOW_FILTER_TAU_S)),
+            ff_outdoor_tau_s=float(config.get(CONF_FF_OUTDOOR_FILTER_TAU_S, DEFAULT_FF_OUTDOOR_FILTER_TAU_S)),
+            ff_flow_deadband_k=float(config.get(CONF_FF_FLOW_DEADBAND_K, DEFAULT_FF_FLOW_DEADBAND_K)),
+            ff_outdoor_deadband_k=float(config.get(CONF_FF_OUTDOOR_DEADBAND_K, DEFAULT_FF_OUTDOOR_DEADBAND_K)),
+            window_threshold_per_min=window_threshold,
+            window_duration=float(config.get(CONF_WINDOW_OPEN_DURATION, DEFAULT_WINDOW_OPEN_DURATION)),
+            imc_process_gain=kp_proc,
+            imc_time_constant=tau,
+            imc_dead_time=theta,
+            imc_lambda=lam_f,
+            temp_range=temp_range,
+            kc=(tau * temp_range) / (kp_proc * (lam_f + theta)),
+            ki=temp_range / (kp_proc * (lam_f + theta)),
+        )
+
+
 class SmartTRVClimate(ClimateEntity, RestoreEntity):
     """Smart TRV Controller Climate Entity."""
 
@@ -47,80 +194,62 @@ class SmartTRVClimate(ClimateEntity, RestoreEntity):
     _attr_supported_features = (ClimateEntityFeature.TARGET_TEMPERATURE | ClimateEntityFeature.TURN_OFF | ClimateEntityFeature.TURN_ON)
     _attr_temperature_unit = UnitOfTemperature.CELSIUS
 
+    # Controller state lives in slots (Entity base classes still provide a __dict__ for HA's own attributes)
+    __slots__ = (
+        "_entry_id", "_config", "_cfg", "_trv_entities", "_trv_valve_pairs", "_target_temp", "_inv_temp_range", "_virtual_setpoint_lut", "_ff_active",
+        "_proportional_gain", "_integral_gain", "_kaw", "_imc_kc_rounded", "_imc_ki_rounded", "_last_u_total",
+        "_last_window_check_temp", "_last_window_check_time", "_window_rate_filt", "_window_open_until",
+        "_hvac_mode", "_current_temperature", "_valve_position", "_desired_valve_position", "_actual_valve_position", "_actual_valve_positions", "_last_actual_poll_monotonic", "_last_valve_send_monotonic",
+        "_i_accum", "_prev_norm_error", "_last_update_monotonic", "_boost_unsub", "_boost_until", "_control_pending", "_control_unsub", "_last_control_monotonic",
+        "_outdoor_temp", "_boiler_flow_temp", "_flow_filt", "_outdoor_filt", "_last_ff_update_monotonic", "_ff_alpha_cache",
+        "_steady_deadband_c", "_decay_tau_s", "_decay_alpha_dt", "_decay_alpha_tau", "_decay_alpha",
+        "_diag_error_c", "_diag_error_norm", "_diag_u_pi", "_diag_u_i", "_diag_u_ff", "_diag_u_total",
+    )
+
     def __init__(self, hass: HomeAssistant, entry_id: str, config: dict[str, Any], ) -> None:
         """Initialize the Smart TRV Controller."""
         self.hass = hass
         self._entry_id = entry_id
         self._config = config
 
-        # Configuration
-        self._name = config.get(CONF_NAME, DEFAULT_NAME)
-        self._temperature_sensor = config.get(CONF_TEMPERATURE_SENSOR)
-        self._trv_entities: list[str] = config.get(CONF_TRV_ENTITIES, [])
-        self._min_temp = float(config.get(CONF_MIN_TEMP, DEFAULT_MIN_TEMP))
-        self._max_temp = float(config.get(CONF_MAX_TEMP, DEFAULT_MAX_TEMP))
-        if self._min_temp >= self._max_temp:
-            _LOGGER.error("Invalid configuration: min_temp (%.1f) >= max_temp (%.1f). Swapping them.", self._min_temp, self._max_temp)
-            self._min_temp, self._max_temp = self._max_temp, self._min_temp
-
-        self._target_temp = float(config.get(CONF_TARGET_TEMP, DEFAULT_TARGET_TEMP))
-        # Clamp target temp to valid range
-        self._target_temp = max(self._min_temp, min(self._max_temp, self._target_temp))
-
-        self._precision = config.get(CONF_PRECISION, DEFAULT_PRECISION)
-        # Optional feed-forward configuration
-        self._outdoor_sensor: str | None = config.get(CONF_OUTDOOR_TEMPERATURE_SENSOR)
-        self._boiler_flow_sensor: str | None = config.get(CONF_BOILER_FLOW_TEMPERATURE_SENSOR)
-        self._ff_k_flow: float = float(config.get(CONF_FF_K_FLOW, DEFAULT_FF_K_FLOW))
-        self._ff_k_outdoor: float = float(config.get(CONF_FF_K_OUTDOOR, DEFAULT_FF_K_OUTDOOR))
-        self._ff_tflow_ref: float = float(config.get(CONF_FF_TFLOW_REF, DEFAULT_FF_TFLOW_REF))
-        self._ff_tout_ref: float = float(config.get(CONF_FF_TOUT_REF, DEFAULT_FF_TOUT_REF))
-        # Feed-forward smoothing & robustness
-        self._ff_enable_smoothing: bool = bool(config.get(CONF_FF_ENABLE_SMOOTHING, DEFAULT_FF_ENABLE_SMOOTHING))
-        self._ff_flow_tau_s: float = float(config.get(CONF_FF_FLOW_FILTER_TAU_S, DEFAULT_FF_FLOW_FILTER_TAU_S))
-        self._ff_outdoor_tau_s: float = float(config.get(CONF_FF_OUTDOOR_FILTER_TAU_S, DEFAULT_FF_OUTDOOR_FILTER_TAU_S))
-        self._ff_flow_deadband_k: float = float(config.get(CONF_FF_FLOW_DEADBAND_K, DEFAULT_FF_FLOW_DEADBAND_K))
-        self._ff_outdoor_deadband_k: float = float(config.get(CONF_FF_OUTDOOR_DEADBAND_K, DEFAULT_FF_OUTDOOR_DEADBAND_K))
-        # IMC/Lambda PI gains from process model (IMC-only controller)
-        self._proportional_gain: float = 0.0
-        self._integral_gain: float = 0.0
+        # Configuration (parsed and validated once into an immutable snapshot). Settings are read
+        # through self._cfg; only runtime state and values derived from it get their own attributes.
+        cfg = self._cfg = _TRVConfig.from_mapping(config)
+        self._set_trv_entities(cfg.trv_entities)
+        self._target_temp = cfg.target_temp
+        # Without any FF sensor the feed-forward term is identically zero; skip its filters per tick
+        self._ff_active: bool = bool(cfg.outdoor_sensor or cfg.boiler_flow_sensor)
         self._last_u_total: float | None = None
-        # IMC parameters are mandatory; controller always operates with computed gains
 
         # Open Window Detection
-        self._window_threshold_per_min = abs(float(config.get(CONF_WINDOW_OPEN_THRESHOLD_PER_MIN, DEFAULT_WINDOW_OPEN_THRESHOLD_PER_MIN)))
-        if self._window_threshold_per_min == 0:
-            self._window_threshold_per_min = DEFAULT_WINDOW_OPEN_THRESHOLD_PER_MIN
-        self._window_duration = float(config.get(CONF_WINDOW_OPEN_DURATION, DEFAULT_WINDOW_OPEN_DURATION))
         self._last_window_check_temp: float | None = None
         self._last_window_check_time: float | None = None
+        # Low-pass filtered temperature rate [K/min]; seeded with the first raw rate
+        self._window_rate_filt: float | None = None
         self._window_open_until: float | None = None
 
-        # Compute IMC gains unconditionally; fall back to sensible defaults
-        kp_proc = float(config.get(CONF_IMC_PROCESS_GAIN, DEFAULT_IMC_PROCESS_GAIN))
-        tau = float(config.get(CONF_IMC_TIME_CONSTANT, DEFAULT_IMC_TIME_CONSTANT))
-        theta = float(config.get(CONF_IMC_DEAD_TIME, DEFAULT_IMC_DEAD_TIME) or 0.0)
-        lam_raw = config.get(CONF_IMC_LAMBDA)
-        lam_f = float(lam_raw) if lam_raw is not None else float(DEFAULT_IMC_LAMBDA)
-
-        if kp_proc <= 0 or tau <= 0 or lam_f <= 0 or (lam_f + theta) <= 0:
-            raise ValueError(f"Invalid IMC parameters: Kp_proc={kp_proc}, tau={tau}, theta={theta}, lambda={lam_f}")
-
-        temp_range = max(MIN_TEMP_RANGE_C, self._max_temp - self._min_temp)
-        kc = (tau * temp_range) / (kp_proc * (lam_f + theta))
-        ki = temp_range / (kp_proc * (lam_f + theta))
-
-        self._proportional_gain = kc
-        self._integral_gain = ki
+        # IMC/Lambda PI gains from process model (IMC-only controller); config-fixed per instance,
+        # options changes reload the entry and rebuild the entity
+        self._inv_temp_range: float = 1.0 / cfg.temp_range
+        # Valve position (0..255) -> virtual setpoint [degC] for the climate-setpoint fallback
+        scale = (cfg.max_temp - cfg.min_temp) * _INV_VALVE_OPEN
+        self._virtual_setpoint_lut: tuple[float, ...] = tuple(cfg.min_temp + i * scale for i in range(VALVE_OPEN_POSITION + 1))
+        self._proportional_gain: float = cfg.kc
+        self._integral_gain: float = cfg.ki
+        # Back-calculation anti-windup gain Kaw = 1/lambda [1/s]
+        self._kaw: float = 1.0 / max(cfg.imc_lambda, 1.0)
+        # Gains are fixed per instance; round them once for the diagnostics attributes
+        self._imc_kc_rounded = _round2(cfg.kc)
+        self._imc_ki_rounded = _round2(cfg.ki)
         _LOGGER.info(
             "IMC tuning: Kc=%.6f, Ki=%.8f (tau=%s s, theta=%s s, lambda=%s s, Kp_proc=%.4f, temp_range=%.2f)",
-            self._proportional_gain,
-            self._integral_gain,
-            tau,
-            theta,
-            lam_f,
-            kp_proc,
-            temp_range,
+            cfg.kc,
+            cfg.ki,
+            cfg.imc_time_constant,
+            cfg.imc_dead_time,
+            cfg.imc_lambda,
+            cfg.imc_process_gain,
+            cfg.temp_range,
         )
 
         # State
@@ -133,6 +262,10 @@ class SmartTRVClimate(ClimateEntity, RestoreEntity):
         # Throttling state for valve updates
         self._last_valve_send_monotonic: float | None = None
         # Pending coalescing is not needed; we coalesce by skipping sends until interval
+        # Sensor-triggered control runs are coalesced: at most one queued at a time
+        self._control_pending: bool = False
+        self._control_unsub = None  # type: ignore[assignment]
+        self._last_control_monotonic: float | None = None
         # Controller integral state (IMC-PI)
         self._i_accum: float = 0.0  # integral over normalized error
         self._last_update_monotonic: float | None = None
@@ -145,9 +278,8 @@ class SmartTRVClimate(ClimateEntity, RestoreEntity):
         self._attr_unique_id = f"{DOMAIN}_{entry_id}"
         # Actual valve position reported by underlying TRVs (aggregated max)
         self._actual_valve_position: int | None = None
-        # Per‑TRV actual valve cache {entity_id: position}
-        self._actual_valve_map: dict[str, int] = {}
-        self._attr_name = self._name
+        self._last_actual_poll_monotonic: float | None = None
+        self._attr_name = cfg.name
         # Feed-forward sensor state cache
         self._outdoor_temp: float | None = None
         self._boiler_flow_temp: float | None = None
@@ -155,12 +287,18 @@ class SmartTRVClimate(ClimateEntity, RestoreEntity):
         self._flow_filt: float | None = None
         self._outdoor_filt: float | None = None
         self._last_ff_update_monotonic: float | None = None
+        # Per-tau (dt, alpha) of the last FF filter step; sensor cadence keeps dt nearly constant
+        self._ff_alpha_cache: dict[float, tuple[float, float]] = {}
 
         # Steady-state handling near setpoint (internal defaults; not exposed in config flow)
         # Pulled from const.py to be consistent with other defaults
         self._steady_deadband_c: float = DEFAULT_STEADY_DEADBAND_C
         self._decay_tau_s: float = DEFAULT_DECAY_TAU_S
         # Bleed rate is derived from IMC tau during IMC setup
+        # Last (dt, tau) -> alpha for the steady decay; integral bleed and output decay share it per tick
+        self._decay_alpha_dt: float | None = None
+        self._decay_alpha_tau: float | None = None
+        self._decay_alpha: float = 1.0
 
         # Diagnostics (initialized to None/zero)
         self._diag_error_c: float | None = None
@@ -171,30 +309,33 @@ class SmartTRVClimate(ClimateEntity, RestoreEntity):
         self._diag_u_total: float | None = None
 
     # --- Small internal helpers for clarity and reuse ---
-    @staticmethod
-    def _clamp01(x: float) -> float:
-        """Clamp a float to the [0, 1] range."""
-        return SmartTRVClimate._clamp(x, 0, 1)
+    def _set_trv_entities(self, trv_entities: Iterable[str]) -> None:
+        """Set the controlled TRVs and derive their valve-position number entity ids once.
 
-    @staticmethod
-    def _clamp(x: float, lo: float, hi: float) -> float:
-        """Clamp a float to the [lo, hi] range."""
-        return lo if x < lo else hi if x > hi else x
+        Both are stored as tuples: they only change with the config and are iterated every send/readout.
+        """
+        self._trv_entities: tuple[str, ...] = tuple(trv_entities)
+        self._trv_valve_pairs: tuple[tuple[str, str], ...] = tuple((eid, _valve_entity_id(eid)) for eid in self._trv_entities)
+        # Per-TRV actual valve cache aligned with _trv_valve_pairs; None where a TRV reports no reading
+        self._actual_valve_positions: tuple[int | None, ...] = (None,) * len(self._trv_entities)
 
     def _ewma(self, prev: float | None, val: float, tau: float, dt_s: float | None) -> float:
         """Exponentially-weighted moving average with time constant tau [s].
 
         If smoothing is disabled, tau<=0, or dt is invalid, returns the raw value.
         """
-        if not self._ff_enable_smoothing or tau <= 0 or dt_s is None or dt_s <= 0:
+        if prev is None or not self._cfg.ff_enable_smoothing or tau <= 0 or dt_s is None or dt_s <= 0:
             return val
-        try:
-            alpha = 1.0 - math.exp(-dt_s / max(1e-6, tau))
-        except Exception:
-            alpha = 1.0
-        if prev is None:
-            return val
-        return prev + alpha * (val - prev)
+        return prev + self._ff_alpha(dt_s, tau) * (val - prev)
+
+    def _ff_alpha(self, dt_s: float, tau: float) -> float:
+        """FF filter step factor, reusing the cached value while dt is within FF_ALPHA_DT_REL_TOL of its dt."""
+        cached = self._ff_alpha_cache.get(tau)
+        if cached is not None and abs(dt_s - cached[0]) <= FF_ALPHA_DT_REL_TOL * cached[0]:
+            return cached[1]
+        alpha = self._alpha(dt_s, tau)
+        self._ff_alpha_cache[tau] = (dt_s, alpha)
+        return alpha
 
     @staticmethod
     def _apply_deadband(x: float, db: float) -> float:
@@ -205,32 +346,40 @@ class SmartTRVClimate(ClimateEntity, RestoreEntity):
             return 0.0
         return x - db if x > 0 else x + db
 
+    @staticmethod
+    def _ff_term(filt: float | None, ref: float, gain: float, deadband: float) -> float:
+        """Feed-forward contribution of one signal: gain * deadband(ref - filt); 0 if unavailable or unused."""
+        if filt is None or gain == 0.0:
+            return 0.0
+        return gain * SmartTRVClimate._apply_deadband(ref - filt, deadband)
+
     @staticmethod
     def _snap_to_step(value: int, step: int, lo: int, hi: int) -> int:
         """Round an integer to the nearest multiple of `step` and clamp to [lo, hi].
 
-        Expects step >= 1. Uses the class clamp helper to keep bounds consistent.
+        Expects step >= 1. Integer-only: rounds half up, which matches round() for odd steps.
         """
+        v = int(value)
+        v = lo if v < lo else hi if v > hi else v
         if step <= 1:
-            return int(SmartTRVClimate._clamp(int(value), lo, hi))
-        v = int(SmartTRVClimate._clamp(int(value), lo, hi))
-        snapped = int(round(v / step)) * step
-        return int(SmartTRVClimate._clamp(snapped, lo, hi))
+            return v
+        v = (v + step // 2) // step * step
+        return lo if v < lo else hi if v > hi else v
 
     @property
     def min_temp(self) -> float:
         """Return the minimum temperature."""
-        return self._min_temp
+        return self._cfg.min_temp
 
     @property
     def max_temp(self) -> float:
         """Return the maximum temperature."""
-        return self._max_temp
+        return self._cfg.max_temp
 
     @property
     def target_temperature_step(self) -> float:
         """Return the precision of the target temperature."""
-        return self._precision
+        return self._cfg.precision
 
     @property
     def current_temperature(self) -> float | None:
@@ -262,44 +411,19 @@ class SmartTRVClimate(ClimateEntity, RestoreEntity):
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return extra state attributes."""
         attrs: dict[str, Any] = {ATTR_VALVE_POSITION: self._valve_position, ATTR_ROOM_TEMPERATURE: self._current_temperature,
-                                 ATTR_TRV_ENTITIES: self._trv_entities, }
-
-        # Helper to round diagnostics to two decimals while keeping numeric types
-        def _rd2(v: Any) -> Any:
-            try:
-                # Keep bools unchanged; they are instances of int in Python
-                if isinstance(v, bool):
-                    return v
-                if isinstance(v, (int, float)):
-                    return round(float(v), 2)
-            except Exception:
-                pass
-            return v
+                                 ATTR_TRV_ENTITIES: list(self._trv_entities), }
 
         # Also include the actual underlying TRVs valve position if known (max across TRVs)
         if self._actual_valve_position is not None:
             attrs[ATTR_ACTUAL_VALVE_POSITION] = int(self._actual_valve_position)
 
         # Enrich with diagnostics when available (rounded to 2 decimals)
-        attrs[ATTR_DESIRED_VALVE_POSITION] = _rd2(self._desired_valve_position)
-        attrs[ATTR_IMC_KC] = _rd2(self._proportional_gain)
-        attrs[ATTR_IMC_KI] = _rd2(self._integral_gain)
-        if self._diag_error_c is not None:
-            attrs[ATTR_ERROR_C] = _rd2(self._diag_error_c)
-        if self._diag_error_norm is not None:
-            attrs[ATTR_ERROR_NORM] = _rd2(self._diag_error_norm)
-        if self._diag_u_pi is not None:
-            attrs[ATTR_U_PI] = _rd2(self._diag_u_pi)
-        if self._diag_u_i is not None:
-            attrs[ATTR_U_I] = _rd2(self._diag_u_i)
-        if self._diag_u_ff is not None:
-            attrs[ATTR_U_FF] = _rd2(self._diag_u_ff)
-        if self._diag_u_total is not None:
-            attrs[ATTR_U_TOTAL] = _rd2(self._diag_u_total)
-        if self._flow_filt is not None:
-            attrs[ATTR_FLOW_FILTERED] = _rd2(self._flow_filt)
-        if self._outdoor_filt is not None:
-            attrs[ATTR_OUTDOOR_FILTERED] = _rd2(self._outdoor_filt)
+        attrs[ATTR_DESIRED_VALVE_POSITION] = _round2(self._desired_valve_position)
+        attrs[ATTR_IMC_KC] = self._imc_kc_rounded
+        attrs[ATTR_IMC_KI] = self._imc_ki_rounded
+        diag_vals = (self._diag_error_c, self._diag_error_norm, self._diag_u_pi, self._diag_u_i, self._diag_u_ff, self._diag_u_total,
+                     self._flow_filt, self._outdoor_filt)
+        attrs.update({k: _round2(v) for k, v in zip(_DIAG_KEYS, diag_vals) if v is not None})
         attrs[ATTR_WINDOW_OPEN] = self._window_open_until is not None and time.monotonic() < self._window_open_until
         return attrs
 
@@ -309,97 +433,131 @@ class SmartTRVClimate(ClimateEntity, RestoreEntity):
 
         # Restore previous state
         if (last_state := await self.async_get_last_state()) is not None:
-            if last_state.state in (HVACMode.OFF, HVACMode.HEAT, HVACMode.AUTO):
+            if last_state.state in _RESTORABLE_HVAC_MODES:
                 self._hvac_mode = HVACMode(last_state.state)
             if ATTR_TEMPERATURE in last_state.attributes:
                 self._target_temp = last_state.attributes[ATTR_TEMPERATURE]
 
         # Subscribe to temperature sensor state changes
-        self.async_on_remove(async_track_state_change_event(self.hass, [self._temperature_sensor], self._async_temperature_changed))
+        self.async_on_remove(async_track_state_change_event(self.hass, [self._cfg.temperature_sensor], self._async_temperature_changed))
         # Subscribe to optional feed-forward sensors
-        ff_entities: list[str] = []
-        if self._outdoor_sensor:
-            ff_entities.append(self._outdoor_sensor)
-        if self._boiler_flow_sensor:
-            ff_entities.append(self._boiler_flow_sensor)
+        ff_entities = [eid for eid in (self._cfg.outdoor_sensor, self._cfg.boiler_flow_sensor) if eid]
         if ff_entities:
             self.async_on_remove(async_track_state_change_event(self.hass, ff_entities, self._async_ff_sensor_changed))
 
         # Get initial temperature
-        await self._async_update_temperature()
+        self._async_update_temperature()
         await self._async_control_heating()
         # Initialize actual valve readout and subscribe to underlying TRV/number changes
-        await self._async_update_actual_valve_position()
-        trv_listen_entities: list[str] = []
-        for trv_entity_id in self._trv_entities:
-            trv_listen_entities.append(trv_entity_id)
-            valve_entity_id = trv_entity_id.replace("climate.", "number.") + "_valve_position"
-            trv_listen_entities.append(valve_entity_id)
+        self._async_update_actual_valve_position()
+        trv_listen_entities = [*self._trv_entities, *(valve_entity_id for _, valve_entity_id in self._trv_valve_pairs)]
         if trv_listen_entities:
             self.async_on_remove(async_track_state_change_event(self.hass, trv_listen_entities, self._async_trv_state_changed))
 
     @callback
     def _async_temperature_changed(self, _event=None) -> None:
         """Handle temperature sensor state changes (HA event callback signature compatible)."""
-        self.hass.async_create_task(self._async_update_temperature())
-        self.hass.async_create_task(self._async_control_heating())
-        self.async_write_ha_state()
+        if self._async_update_temperature():
+            self.async_write_ha_state()
+            self._async_schedule_control()
+        elif self._valve_send_pending():
+            # Repeated reading: still give a throttled valve command its next chance to go out
+            self._async_schedule_control()
 
     @callback
     def _async_ff_sensor_changed(self, _event=None) -> None:
         """Handle outdoor/boiler flow sensor state changes (HA event callback signature compatible)."""
-        # Refresh FF sensor cache and re-run control
-        self.hass.async_create_task(self._async_update_ff_sensors())
-        self.hass.async_create_task(self._async_control_heating())
+        # Refresh FF sensor cache and re-run control; raw FF values are not exposed,
+        # so the state is published once by the queued control run
+        if self._async_update_ff_sensors() or self._valve_send_pending():
+            self._async_schedule_control()
+
+    def _valve_send_pending(self) -> bool:
+        """Return True if a throttled valve command has not been sent yet."""
+        # _valve_position holds the snapped command actually sent; compare like with like
+        desired = self._snap_to_step(self._desired_valve_position, _VALVE_SNAP_STEP, VALVE_CLOSED_POSITION, VALVE_OPEN_POSITION)
+        return desired != self._valve_position
+
+    @callback
+    def _async_schedule_control(self) -> None:
+        """Queue a single control run; bursts of events share one run.
+
+        Runs are throttled to one per CONTROL_MIN_INTERVAL_S: inside the interval the run is
+        deferred to its end (trailing edge) rather than restarted, so chattering sensors cannot
+        starve the controller and the deferred run uses the latest cached values.
+        """
+        if self._control_pending:
+            return
+        self._control_pending = True
+        last = self._last_control_monotonic
+        delay = 0.0 if last is None else CONTROL_MIN_INTERVAL_S - (time.monotonic() - last)
+        if delay > 0:
+            self._control_unsub = async_call_later(self.hass, delay, self._async_control_timer_fired)
+        else:
+            self.hass.async_create_task(self._async_run_control_once())
+
+    async def _async_control_timer_fired(self, _now) -> None:
+        """Run the deferred control pass."""
+        self._control_unsub = None
+        await self._async_run_control_once()
+
+    async def _async_run_control_once(self) -> None:
+        """Run one control pass on the cached sensor values and publish state."""
+        # Clear the flag before the pass so events arriving mid-run queue a new pass
+        self._control_pending = False
+        now = time.monotonic()
+        self._last_control_monotonic = now
+        await self._async_control_heating(now)
         self.async_write_ha_state()
 
     @callback
     def _async_trv_state_changed(self, _event=None) -> None:
         """Handle underlying TRV/valve number state changes."""
-        self.hass.async_create_task(self._async_update_actual_valve_position())
+        self._async_update_actual_valve_position()
         self.async_write_ha_state()
 
-    async def _async_update_temperature(self) -> None:
-        """Update the current temperature from the sensor."""
-        state = self.hass.states.get(self._temperature_sensor)
-        if state is None or state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
-            _LOGGER.warning("Temperature sensor %s is unavailable", self._temperature_sensor)
-            return
+    @callback
+    def _async_update_temperature(self) -> bool:
+        """Update the current temperature from the sensor; return True if the cached value changed."""
+        state = self.hass.states.get(self._cfg.temperature_sensor)
+        if state is None or state.state in _BAD_STATES:
+            _LOGGER.warning("Temperature sensor %s is unavailable", self._cfg.temperature_sensor)
+            return False
 
         try:
-            self._current_temperature = float(state.state)
+            value = float(state.state)
         except ValueError:
-            _LOGGER.error("Unable to parse temperature from %s: %s", self._temperature_sensor, state.state, )
-
-    async def _async_update_ff_sensors(self) -> None:
-        """Update cached outdoor and boiler flow temperatures if configured."""
-        # Outdoor
-        if self._outdoor_sensor:
-            st = self.hass.states.get(self._outdoor_sensor)
-            if st is not None and st.state not in (STATE_UNAVAILABLE, STATE_UNKNOWN):
-                try:
-                    self._outdoor_temp = float(st.state)
-                except (TypeError, ValueError):
-                    self._outdoor_temp = None
-            else:
-                self._outdoor_temp = None
-        # Boiler flow
-        if self._boiler_flow_sensor:
-            st = self.hass.states.get(self._boiler_flow_sensor)
-            if st is not None and st.state not in (STATE_UNAVAILABLE, STATE_UNKNOWN):
-                try:
-                    self._boiler_flow_temp = float(st.state)
-                except (TypeError, ValueError):
-                    self._boiler_flow_temp = None
-            else:
-                self._boiler_flow_temp = None
+            _LOGGER.error("Unable to parse temperature from %s: %s", self._cfg.temperature_sensor, state.state, )
+            return False
+        if not _value_changed(self._current_temperature, value, SENSOR_TEMP_CHANGE_EPSILON_C):
+            return False
+        self._current_temperature = value
+        return True
+
+    @callback
+    def _async_update_ff_sensors(self) -> bool:
+        """Update cached outdoor and boiler flow temperatures if configured; return True if any changed."""
+        states = self.hass.states
+        cfg = self._cfg
+        changed = False
+        if cfg.outdoor_sensor:
+            value = _state_to_float(states.get(cfg.outdoor_sensor))
+            if _value_changed(self._outdoor_temp, value, SENSOR_FF_CHANGE_EPSILON_K):
+                self._outdoor_temp = value
+                changed = True
+        if cfg.boiler_flow_sensor:
+            value = _state_to_float(states.get(cfg.boiler_flow_sensor))
+            if _value_changed(self._boiler_flow_temp, value, SENSOR_FF_CHANGE_EPSILON_K):
+                self._boiler_flow_temp = value
+                changed = True
+        return changed
 
     # --- Controller building blocks (extracted from _async_control_heating) ---
-    async def _handle_off_mode(self) -> bool:
+    async def _handle_off_mode(self, now: float) -> bool:
         """If HVAC is OFF, force valve closed and reset controller; return True if handled."""
         if self._hvac_mode != HVACMode.OFF:
             return False
-        await self._async_request_valve_position(VALVE_CLOSED_POSITION, force=True)
+        await self._async_request_valve_position(VALVE_CLOSED_POSITION, force=True, now=now)
         # Reset PI/internals
         self._i_accum = 0.0
         self._prev_norm_error = None
@@ -413,63 +571,56 @@ class SmartTRVClimate(ClimateEntity, RestoreEntity):
         self._diag_u_total = None
         return True
 
-    async def _handle_boost_mode(self) -> bool:
+    async def _handle_boost_mode(self, now: float) -> bool:
         """If HVAC is HEAT (boost), fully open valve; return True if handled and possibly switch back to AUTO."""
         if self._hvac_mode != HVACMode.HEAT:
             return False
-        await self._async_request_valve_position(VALVE_OPEN_POSITION, force=True)
-        # Check boost expiry
-        if self._boost_until is not None and time.monotonic() >= self._boost_until:
+        await self._async_request_valve_position(VALVE_OPEN_POSITION, force=True, now=now)
+        # Expiry is handled by the one-shot timer; only poll the clock if arming it failed
+        if self._boost_unsub is None and self._boost_until is not None and now >= self._boost_until:
             await self.async_set_hvac_mode(HVACMode.AUTO)
         return True
 
-    def _compute_error_and_timing(self) -> tuple[float, float, float, float | None]:
-        """Compute error, temp_range, normalized positive error, and dt (s). Updates diagnostics and timing state."""
+    def _compute_error_and_timing(self, now: float) -> tuple[float, float, float | None]:
+        """Compute error, normalized positive error, and dt (s) at tick time `now`. Updates diagnostics and timing state."""
         error = self._target_temp - (self._current_temperature or self._target_temp)
         self._diag_error_c = float(error)
-        temp_range = max(MIN_TEMP_RANGE_C, self._max_temp - self._min_temp)
-        now = time.monotonic()
+        temp_range = self._cfg.temp_range
         dt: float | None = None
         if self._last_update_monotonic is not None:
             # Ensure a strictly positive dt when previous timestamp exists to progress filters/bleed
             dt = max(1e-6, now - self._last_update_monotonic)
         self._last_update_monotonic = now
-        norm_error = max(0.0, min(error, temp_range)) / temp_range
+        norm_error = max(0.0, min(error, temp_range)) * self._inv_temp_range
         self._diag_error_norm = float(norm_error)
-        return error, temp_range, norm_error, dt
+        return error, norm_error, dt
 
-    def _update_feedforward(self) -> tuple[float, float]:
-        """Update FF filters and compute raw and final feed-forward (u_ff_raw, u_ff).
+    def _update_feedforward(self, now: float) -> float:
+        """Update FF filters at tick time `now` and return the feed-forward command u_ff. Updates diagnostics.
 
         Note: Rate limiting of the feed-forward component has been removed; smoothing
         is provided by EWMA filtering and deadbands only.
         """
-        u_ff = 0.0
-        ff_now = time.monotonic()
+        if not self._ff_active:
+            self._diag_u_ff = 0.0
+            return 0.0
+
         ff_dt: float | None = None
         if self._last_ff_update_monotonic is not None:
-            ff_dt = max(0.0, ff_now - self._last_ff_update_monotonic)
-        self._last_ff_update_monotonic = ff_now
+            ff_dt = max(0.0, now - self._last_ff_update_monotonic)
+        self._last_ff_update_monotonic = now
 
         if self._boiler_flow_temp is not None:
-            self._flow_filt = self._ewma(self._flow_filt, self._boiler_flow_temp, self._ff_flow_tau_s, ff_dt)
+            self._flow_filt = self._ewma(self._flow_filt, self._boiler_flow_temp, self._cfg.ff_flow_tau_s, ff_dt)
         if self._outdoor_temp is not None:
-            self._outdoor_filt = self._ewma(self._outdoor_filt, self._outdoor_temp, self._ff_outdoor_tau_s, ff_dt)
-
-        u_ff_raw = 0.0
-        if self._flow_filt is not None and self._ff_k_flow != 0.0:
-            d_flow = self._ff_tflow_ref - self._flow_filt
-            d_flow = self._apply_deadband(d_flow, self._ff_flow_deadband_k)
-            u_ff_raw += self._ff_k_flow * d_flow
-        if self._outdoor_filt is not None and self._ff_k_outdoor != 0.0:
-            d_out = self._ff_tout_ref - self._outdoor_filt
-            d_out = self._apply_deadband(d_out, self._ff_outdoor_deadband_k)
-            u_ff_raw += self._ff_k_outdoor * d_out
+            self._outdoor_filt = self._ewma(self._outdoor_filt, self._outdoor_temp, self._cfg.ff_outdoor_tau_s, ff_dt)
 
         # No rate limiting: use raw feed-forward directly (still filtered by EWMA/deadbands)
-        u_ff = u_ff_raw
+        cfg = self._cfg
+        u_ff = (self._ff_term(self._flow_filt, cfg.ff_tflow_ref, cfg.ff_k_flow, cfg.ff_flow_deadband_k)
+                + self._ff_term(self._outdoor_filt, cfg.ff_tout_ref, cfg.ff_k_outdoor, cfg.ff_outdoor_deadband_k))
         self._diag_u_ff = float(u_ff)
-        return u_ff_raw, u_ff
+        return u_ff
 
     @staticmethod
     def _classify_band(error: float, eps: float) -> tuple[bool, bool, bool]:
@@ -482,8 +633,10 @@ class SmartTRVClimate(ClimateEntity, RestoreEntity):
     def _update_integral(self, norm_error: float, heat_side: bool, cool_side: bool, dt: float | None, u_ff: float = 0.0) -> None:
         """Integral separation and bleed behavior; updates internal integral state.
 
-        Anti-windup: prevent integral growth when either the PI estimate or the
-        actual clamped output (PI + FF) would exceed saturation (1.0).
+        Anti-windup (heat side): back-calculation. The integrator follows
+        Ki·e·dt + Kaw·(u_sat − u_raw)·dt with u_raw = PI + FF and u_sat its clamp to
+        [0, 1], so it stops winding up once the output saturates and unwinds
+        with time constant 1/Kaw = lambda.
 
         Bleed behavior (in-band and cool-side):
         - Instead of a fixed-rate bleed based on IMC tau, decay the integral
@@ -493,42 +646,37 @@ class SmartTRVClimate(ClimateEntity, RestoreEntity):
           output decay logic.
         """
         if dt is not None and dt > 0:
-            u_p = self._proportional_gain * norm_error
-            u_i = self._integral_gain * self._i_accum
-            u_pi_est = u_p + u_i
-            # Also check if actual output would saturate (includes feed-forward)
-            u_total_est = u_pi_est + u_ff
-
             if heat_side:
-                # Only accumulate if neither PI nor total output is saturated
-                if u_pi_est < 1.0 and u_total_est < 1.0:
-                    self._i_accum += norm_error * dt
+                # Saturation is judged on the actual command (PI + feed-forward)
+                u_raw = self._proportional_gain * norm_error + self._integral_gain * self._i_accum + u_ff
+                u_sat = 0.0 if u_raw < 0.0 else 1.0 if u_raw > 1.0 else u_raw
+                # Cap the back-calculation step at one full correction for very long dt;
+                # the correction is in output units, so map it to the accumulator via 1/Ki
+                kaw_dt = self._kaw * dt
+                if kaw_dt > 1.0:
+                    kaw_dt = 1.0
+                self._i_accum = max(0.0, self._i_accum + norm_error * dt + kaw_dt * (u_sat - u_raw) / self._integral_gain)
             else:
                 # Cool side or in-band: exponentially decay the integral
                 # contribution u_i toward zero using the steady decay tau.
                 # Apply the same alpha helper used by output decay.
                 if self._decay_tau_s > 0:
-                    alpha = self._alpha(dt, self._decay_tau_s)
-                    # u_i_new = (1 - alpha) * u_i (toward 0)
-                    u_i_new = (1.0 - alpha) * u_i
-                    # Map back to internal accumulator (avoid division by 0)
-                    if self._integral_gain > 0.0:
-                        self._i_accum = max(0.0, u_i_new / self._integral_gain)
-                    else:
-                        # If Ki is zero (should not happen with valid IMC params), just zero it
-                        self._i_accum = 0.0
+                    alpha = self._decay_step(dt)
+                    # u_i_new = (1 - alpha) * u_i (toward 0); u_i = Ki * i_accum with Ki > 0,
+                    # so scale the accumulator directly instead of mapping back through 1/Ki
+                    self._i_accum = max(0.0, (1.0 - alpha) * self._i_accum)
                 else:
                     # If decay tau is invalid, fall back to immediate zeroing
                     self._i_accum = 0.0
         # Finished integral update
 
-    def _compute_pi(self, norm_error: float) -> tuple[float, float]:
-        """Compute PI output and integral contribution (u_pi, u_i). Updates diagnostics."""
+    def _compute_pi(self, norm_error: float) -> float:
+        """Compute PI output u_pi. Updates diagnostics (including the integral contribution u_i)."""
         u_i = self._integral_gain * self._i_accum
         u_pi = (self._proportional_gain * norm_error + u_i)
         self._diag_u_pi = float(u_pi)
         self._diag_u_i = float(u_i)
-        return u_pi, u_i
+        return u_pi
 
     # Small math helper used by decision logic
     @staticmethod
@@ -539,10 +687,17 @@ class SmartTRVClimate(ClimateEntity, RestoreEntity):
         """
         if dt_s is None or dt_s <= 0 or tau_s <= 0:
             return 1.0
-        try:
-            return 1.0 - math.exp(-dt_s / tau_s)
-        except Exception:
-            return 1.0
+        # dt/tau > 0 here, so exp() only underflows towards 0.0 and cannot raise
+        return 1.0 - math.exp(-dt_s / tau_s)
+
+    def _decay_step(self, dt_s: float | None) -> float:
+        """Step factor for the steady decay tau, reused while dt and tau are unchanged (one exp per tick)."""
+        tau_s = self._decay_tau_s
+        if dt_s != self._decay_alpha_dt or tau_s != self._decay_alpha_tau:
+            self._decay_alpha = self._alpha(dt_s, tau_s)
+            self._decay_alpha_dt = dt_s
+            self._decay_alpha_tau = tau_s
+        return self._decay_alpha
 
     def _decide_u_total(self, u_pi: float, u_ff: float, error: float, heat_side: bool, dt: float | None) -> float:
         """Decide the final normalized command `u_total ∈ [0,1]`.
@@ -560,11 +715,12 @@ class SmartTRVClimate(ClimateEntity, RestoreEntity):
         if self._last_u_total is not None:
             prev_u = self._last_u_total
         else:
-            prev_u = (self._desired_valve_position if self._desired_valve_position is not None else self._valve_position) / float(VALVE_OPEN_POSITION)
-            prev_u = self._clamp01(prev_u)
+            prev_u = (self._desired_valve_position if self._desired_valve_position is not None else self._valve_position) * _INV_VALVE_OPEN
+            prev_u = 0.0 if prev_u < 0.0 else 1.0 if prev_u > 1.0 else prev_u
 
         # Suggested immediate command from PI + FF (normalized)
-        u_suggest = self._clamp01(u_pi + u_ff)
+        u_suggest = u_pi + u_ff
+        u_suggest = 0.0 if u_suggest < 0.0 else 1.0 if u_suggest > 1.0 else u_suggest
 
         # Cache timing validity for decay calculations
         has_timing = (dt is not None and dt > 0 and self._decay_tau_s > 0)
@@ -576,7 +732,7 @@ class SmartTRVClimate(ClimateEntity, RestoreEntity):
             # Smoothstep weight w ∈ [0,1] from cool-side (0) to heat-side (1)
             # Map error ∈ [-eps_blend, +eps_blend] → x ∈ [0,1]
             x = (error + eps_blend) / (2.0 * eps_blend)
-            x = self._clamp(x, 0.0, 1.0)
+            x = 0.0 if x < 0.0 else 1.0 if x > 1.0 else x
             w = x * x * (3.0 - 2.0 * x)
 
             # Heat suggestion
@@ -584,13 +740,13 @@ class SmartTRVClimate(ClimateEntity, RestoreEntity):
 
             # Decay suggestion (toward fully closed)
             if has_timing:
-                a = self._alpha(dt, self._decay_tau_s)
+                a = self._decay_step(dt)
                 u_decay = max(0.0, prev_u + a * (0.0 - prev_u))
             else:
                 u_decay = 0.0
 
             u_blend = w * u_heat + (1.0 - w) * u_decay
-            return self._clamp01(u_blend)
+            return 0.0 if u_blend < 0.0 else 1.0 if u_blend > 1.0 else u_blend
 
         # Heat side: track PI+FF
         if heat_side:
@@ -598,7 +754,7 @@ class SmartTRVClimate(ClimateEntity, RestoreEntity):
 
         # In-band and cool side: decay toward fully closed
         if has_timing:
-            a = self._alpha(dt, self._decay_tau_s)
+            a = self._decay_step(dt)
             return max(0.0, prev_u + a * (0.0 - prev_u))
 
         # Fallback when timing unknown: close immediately
@@ -617,6 +773,9 @@ class SmartTRVClimate(ClimateEntity, RestoreEntity):
                 # Expired
                 self._window_open_until = None
                 _LOGGER.info("Window open mode expired. Resuming normal control.")
+                # Re-establish the reference below; rates from before the window opened are stale
+                self._last_window_check_time = None
+                self._window_rate_filt = None
 
         # Check for rapid drop
         if self._last_window_check_time is None:
@@ -630,48 +789,60 @@ class SmartTRVClimate(ClimateEntity, RestoreEntity):
             return False
 
         delta_t = current_temp - self._last_window_check_temp
-        rate_per_min = (delta_t / dt) * 60.0
+        raw_rate_per_min = (delta_t / dt) * 60.0
+        # First-order low-pass on the derivative, alpha = dt / (tau + dt), to suppress sensor jitter
+        if self._window_rate_filt is None:
+            rate_per_min = raw_rate_per_min
+        else:
+            rate_per_min = self._window_rate_filt + (dt / (WINDOW_RATE_FILTER_TAU_S + dt)) * (raw_rate_per_min - self._window_rate_filt)
+        self._window_rate_filt = rate_per_min
 
         # Update reference for next check
         self._last_window_check_temp = current_temp
         self._last_window_check_time = now
 
-        # If rate is significantly negative (drop)
-        if rate_per_min < -self._window_threshold_per_min:
-            self._window_open_until = now + self._window_duration
+        # If rate is significantly negative (drop); a drop exactly at the threshold counts
+        if rate_per_min <= -self._cfg.window_threshold_per_min:
+            self._window_open_until = now + self._cfg.window_duration
             _LOGGER.warning("Window open detected! Temp dropped %.2f K in %.1f s (rate %.2f K/min). Suppressing heat for %.0f s.", delta_t, dt, rate_per_min,
-                            self._window_duration)
+                            self._cfg.window_duration)
             return True
 
         return False
 
-    async def _async_control_heating(self) -> None:
-        """Control the heating based on current and target temperature."""
-        if await self._handle_off_mode():
+    async def _async_control_heating(self, now: float | None = None) -> None:
+        """Control the heating based on current and target temperature.
+
+        `now` is the tick timestamp when the caller already read the clock.
+        """
+        # One timestamp per tick keeps boost, window, PI, FF and valve-send timing consistent
+        if now is None:
+            now = time.monotonic()
+
+        if await self._handle_off_mode(now):
             return
 
         # In HEAT mode, operate as a timed boost: fully open for the boost window
-        if await self._handle_boost_mode():
+        if await self._handle_boost_mode(now):
             return
 
         if self._current_temperature is None:
             _LOGGER.debug("No current temperature available, skipping control")
             return
 
-        now = time.monotonic()
         # Window open check (suppress heating if rapid drop detected)
         if self._check_window_open(self._current_temperature, now):
             # Force valve closed and reset integral to avoid stale accumulation
             self._i_accum = 0.0
             if self._valve_position != VALVE_CLOSED_POSITION:
-                await self._async_request_valve_position(VALVE_CLOSED_POSITION, force=True)
+                await self._async_request_valve_position(VALVE_CLOSED_POSITION, force=True, now=now)
             return
 
         # AUTO mode core loop components
-        error, temp_range, norm_error, dt = self._compute_error_and_timing()
+        error, norm_error, dt = self._compute_error_and_timing(now)
 
-        # Feed-forward update (raw)
-        _u_ff_raw, u_ff = self._update_feedforward()
+        # Feed-forward update
+        u_ff = self._update_feedforward(now)
 
         # Determine bands around setpoint
         eps = self._steady_deadband_c
@@ -681,25 +852,27 @@ class SmartTRVClimate(ClimateEntity, RestoreEntity):
         self._update_integral(norm_error, heat_side, cool_side, dt, u_ff)
 
         # Compute PI and decide final command
-        u_pi, _u_i = self._compute_pi(norm_error)
+        u_pi = self._compute_pi(norm_error)
         u_total = self._decide_u_total(u_pi, u_ff, error, heat_side, dt)
         self._diag_u_total = float(u_total)
         self._last_u_total = u_total
         valve_position = int(round(u_total * VALVE_OPEN_POSITION))
 
-        await self._async_request_valve_position(valve_position)
+        await self._async_request_valve_position(valve_position, now=now)
 
-    async def _async_request_valve_position(self, position: int, force: bool = False) -> None:
+    async def _async_request_valve_position(self, position: int, force: bool = False, now: float | None = None) -> None:
         """Request a valve update, throttled to at most once per minute unless forced.
 
         - force=True: send immediately (used for OFF/HEAT transitions and critical changes).
         - force=False: coalesce and delay so that sends occur at most once per minute.
+        - now: the caller's control-tick timestamp; read from the clock when omitted.
         """
         # Clamp to valid range
-        position = max(VALVE_CLOSED_POSITION, min(VALVE_OPEN_POSITION, int(position)))
+        position = _clamp_valve(int(position))
         self._desired_valve_position = position
 
-        now = time.monotonic()
+        if now is None:
+            now = time.monotonic()
 
         # Decide whether to send now
         send_now = force
@@ -712,141 +885,139 @@ class SmartTRVClimate(ClimateEntity, RestoreEntity):
                     send_now = True
 
         if send_now:
-            await self._async_set_valve_position(position)
-            self._last_valve_send_monotonic = time.monotonic()
+            await self._async_set_valve_position(position, now)
+            self._last_valve_send_monotonic = now
             return
 
         # Otherwise, skip sending now; the next control tick will re-evaluate and send when allowed
 
-    async def _async_set_valve_position(self, position: int) -> None:
+    async def _async_set_valve_position(self, position: int, now: float | None = None) -> None:
         """Immediately set the valve position on all TRVs (no throttling).
 
         Note: external callers should use _async_request_valve_position.
         """
-        # Enforce minimum step size to reduce chattering at the TRV layer
-        try:
-            step = max(1, int(VALVE_MIN_STEP))
-        except Exception:
-            step = 5
-        # Clamp and optionally snap to step using existing helpers
-        if step > 1:
-            position = self._snap_to_step(int(position), step, VALVE_CLOSED_POSITION, VALVE_OPEN_POSITION)
-        else:
-            position = int(self._clamp(int(position), VALVE_CLOSED_POSITION, VALVE_OPEN_POSITION))
-        
+        # Enforce minimum step size to reduce chattering at the TRV layer (clamps as well)
+        position = self._snap_to_step(position, _VALVE_SNAP_STEP, VALVE_CLOSED_POSITION, VALVE_OPEN_POSITION)
+
         # If requested equals last commanded, we may still need to resend selectively
         # to any underlying TRV whose actual does not match the target.
         resend_selectively = False
+        actuals = self._actual_valve_positions
         if position == self._valve_position:
-            # Determine if any individual TRV differs from target
-            for trv_entity_id in self._trv_entities:
-                trv_actual = self._actual_valve_map.get(trv_entity_id)
-                # Only treat as mismatch when we have an actual reading and it differs
-                if trv_actual is not None and trv_actual != position:
-                    resend_selectively = True
-                    break
-            # If no per‑TRV mismatch found but aggregated actual differs, resend to all
-            if not resend_selectively and self._actual_valve_position is not None and self._actual_valve_position != position:
-                resend_selectively = True
-            if not resend_selectively:
+            # Single pass over the per-TRV readings (TRVs without a reading count as matching);
+            # also resend if the aggregated actual differs
+            aggregate = self._actual_valve_position
+            if (aggregate is None or aggregate == position) and all(v is None or v == position for v in actuals):
                 _LOGGER.debug("Skipping valve position update, all TRVs already at %d", position)
                 return
+            resend_selectively = True
 
         # Propagate to underlying TRVs; reflect last commanded locally
+        command_changed = position != self._valve_position
         self._valve_position = position
 
-        for trv_entity_id in self._trv_entities:
-            try:
-                # Get the TRV's current state to determine how to control it
-                trv_state = self.hass.states.get(trv_entity_id)
-                if trv_state is None:
-                    _LOGGER.warning("TRV entity %s not found", trv_entity_id)
-                    continue
-
-                # If we are in selective resend mode, skip TRVs already at target
-                if resend_selectively:
-                    trv_actual = self._actual_valve_map.get(trv_entity_id)
-                    if trv_actual is not None and trv_actual == position:
-                        continue
-
-                # Try to set valve position via number entity if available
-                # Many TRVs expose a separate number entity for valve position
-                valve_entity_id = trv_entity_id.replace("climate.", "number.") + "_valve_position"
-                valve_state = self.hass.states.get(valve_entity_id)
-
-                if valve_state is not None:
-                    # Use number service to set valve position directly
-                    await self.hass.services.async_call(
-                        "number",
-                        "set_value",
-                        {"entity_id": valve_entity_id, "value": position},
-                        blocking=True,
-                    )
-                    _LOGGER.debug("Set valve position to %d on %s via number entity", position, valve_entity_id, )
-                else:
-                    # Fall back to controlling the TRV via temperature
-                    # Calculate an effective temperature setpoint based on valve position
-                    if position == VALVE_CLOSED_POSITION:
-                        # Turn off the TRV
-                        await self.hass.services.async_call("climate", "set_hvac_mode", {"entity_id": trv_entity_id, "hvac_mode": HVACMode.OFF, },
-                                                            blocking=True, )
-                    else:
-                        # Ensure TRV is in heat mode
-                        if trv_state.state == HVACMode.OFF:
-                            await self.hass.services.async_call("climate", "set_hvac_mode", {"entity_id": trv_entity_id, "hvac_mode": HVACMode.HEAT, },
-                                                                blocking=True, )
-
-                        # Map valve position (0-255) to a temperature offset
-                        # This creates a virtual setpoint to trick the TRV
-                        temp_range = self._max_temp - self._min_temp
-                        virtual_setpoint = self._min_temp + (position / float(VALVE_OPEN_POSITION)) * temp_range
-
-                        await self.hass.services.async_call("climate", "set_temperature", {"entity_id": trv_entity_id, ATTR_TEMPERATURE: virtual_setpoint, },
-                                                            blocking=True, )
-
-                    _LOGGER.debug("Controlled TRV %s based on valve position %d", trv_entity_id, position, )
+        # In selective resend mode, skip TRVs already at target (before any state lookups).
+        # TRVs exposing a valve-position number entity share one batched set_value call;
+        # the others fall back to per-TRV climate control.
+        states_get = self.hass.states.get
+        number_entity_ids: list[str] = []
+        pushes = []
+        for (trv_entity_id, valve_entity_id), actual in zip(self._trv_valve_pairs, actuals):
+            if resend_selectively and actual == position:
+                continue
+            if states_get(valve_entity_id) is not None:
+                number_entity_ids.append(valve_entity_id)
+            else:
+                pushes.append(self._async_push_climate_fallback(trv_entity_id, position))
+        if number_entity_ids:
+            pushes.append(self._async_push_number_value(number_entity_ids, position))
+        # Dispatch concurrently; failures are logged inside the helpers. A single push (one TRV, or
+        # only number entities) is awaited directly, as gather would wrap it in a Task for nothing.
+        if len(pushes) == 1:
+            await pushes[0]
+        elif pushes:
+            await asyncio.gather(*pushes, return_exceptions=True)
+        # After commanding, try to refresh the actual position reading. TRV/number state events
+        # refresh it as well, so a resend of an unchanged command skips a recent re-poll.
+        if now is None:
+            now = time.monotonic()
+        last_poll = self._last_actual_poll_monotonic
+        if command_changed or last_poll is None or now - last_poll >= ACTUAL_VALVE_POLL_MIN_INTERVAL_S:
+            self._async_update_actual_valve_position(now)
+
+    async def _async_push_number_value(self, valve_entity_ids: list[str], position: int) -> None:
+        """Send one number.set_value to all given valve-position number entities; errors are logged."""
+        try:
+            await self.hass.services.async_call(
+                "number",
+                "set_value",
+                {"entity_id": valve_entity_ids, "value": position},
+                blocking=True,
+            )
+            _LOGGER.debug("Set valve position to %d on %s via number entity", position, valve_entity_ids)
+        except Exception as err:
+            _LOGGER.error("Failed to set valve position on %s: %s", ", ".join(valve_entity_ids), err)
+
+    async def _async_push_climate_fallback(self, trv_entity_id: str, position: int) -> None:
+        """Control one TRV without a valve number entity through its climate setpoint; errors are logged."""
+        try:
+            trv_state = self.hass.states.get(trv_entity_id)
+            if trv_state is None:
+                _LOGGER.warning("TRV entity %s not found", trv_entity_id)
+                return
 
-            except Exception as err:
-                _LOGGER.error("Failed to set valve position on %s: %s", trv_entity_id, err, )
-        # After commanding, try to refresh the actual position reading
-        await self._async_update_actual_valve_position()
+            # Calculate an effective temperature setpoint based on valve position
+            if position == VALVE_CLOSED_POSITION:
+                # Turn off the TRV
+                await self.hass.services.async_call("climate", "set_hvac_mode", {"entity_id": trv_entity_id, "hvac_mode": HVACMode.OFF, },
+                                                    blocking=True, )
+            else:
+                # Ensure TRV is in heat mode
+                if trv_state.state == HVACMode.OFF:
+                    await self.hass.services.async_call("climate", "set_hvac_mode", {"entity_id": trv_entity_id, "hvac_mode": HVACMode.HEAT, },
+                                                        blocking=True, )
 
-    async def _async_update_actual_valve_position(self) -> None:
+                # Map valve position (0-255) to a temperature offset
+                # This creates a virtual setpoint to trick the TRV
+                virtual_setpoint = self._virtual_setpoint_lut[position]
+
+                await self.hass.services.async_call("climate", "set_temperature", {"entity_id": trv_entity_id, ATTR_TEMPERATURE: virtual_setpoint, },
+                                                    blocking=True, )
+
+            _LOGGER.debug("Controlled TRV %s based on valve position %d", trv_entity_id, position, )
+
+        except Exception as err:
+            _LOGGER.error("Failed to set valve position on %s: %s", trv_entity_id, err, )
+
+    @callback
+    def _async_update_actual_valve_position(self, now: float | None = None) -> None:
         """Read actual valve opening from underlying TRVs and cache the aggregated max (0..255)."""
-        max_pos: int | None = None
-        local_map: dict[str, int] = {}
-        for trv_entity_id in self._trv_entities:
+        states_get = self.hass.states.get
+        readings: list[int | None] = []
+        for trv_entity_id, valve_entity_id in self._trv_valve_pairs:
+            reading = None
             # Prefer number.<trv>_valve_position if present
-            valve_entity_id = trv_entity_id.replace("climate.", "number.") + "_valve_position"
             try:
-                valve_state = self.hass.states.get(valve_entity_id)
-                if valve_state is not None and valve_state.state not in (STATE_UNAVAILABLE, STATE_UNKNOWN):
-                    try:
-                        v = float(valve_state.state)
-                        v_clamped = max(VALVE_CLOSED_POSITION, min(VALVE_OPEN_POSITION, int(round(v))))
-                        max_pos = v_clamped if max_pos is None else max(max_pos, v_clamped)
-                        local_map[trv_entity_id] = v_clamped
-                        continue
-                    except (TypeError, ValueError):
-                        pass
-
-                # Fallback: check climate attribute `valve_position` if exposed by the TRV
-                trv_state = self.hass.states.get(trv_entity_id)
-                if trv_state is not None:
-                    vp = trv_state.attributes.get("valve_position")
+                v = _state_to_float(states_get(valve_entity_id))
+                if v is None:
+                    # Fallback: check climate attribute `valve_position` if exposed by the TRV
+                    trv_state = states_get(trv_entity_id)
+                    vp = trv_state.attributes.get("valve_position") if trv_state is not None else None
                     if vp is not None:
                         try:
                             v = float(vp)
-                            v_clamped = max(VALVE_CLOSED_POSITION, min(VALVE_OPEN_POSITION, int(round(v))))
-                            max_pos = v_clamped if max_pos is None else max(max_pos, v_clamped)
-                            local_map[trv_entity_id] = v_clamped
                         except (TypeError, ValueError):
                             pass
+                if v is not None:
+                    # round() of a float already yields an int; clamp in one step
+                    reading = _clamp_valve(round(v))
             except Exception as err:
                 _LOGGER.debug("While reading actual valve from %s: %s", trv_entity_id, err)
+            readings.append(reading)
 
-        self._actual_valve_position = max_pos
-        self._actual_valve_map = local_map
+        self._actual_valve_positions = tuple(readings)
+        self._actual_valve_position = max((v for v in readings if v is not None), default=None)
+        self._last_actual_poll_monotonic = time.monotonic() if now is None else now
 
     async def async_set_temperature(self, **kwargs: Any) -> None:
         """Set the target temperature."""
@@ -869,10 +1040,11 @@ class SmartTRVClimate(ClimateEntity, RestoreEntity):
         if hvac_mode == HVACMode.HEAT:
             # Start 15-minute boost: set fully open and schedule fallback to AUTO
             self._hvac_mode = HVACMode.HEAT
-            # Set valve immediately
-            await self._async_request_valve_position(VALVE_OPEN_POSITION, force=True)
+            # Set valve immediately; the boost window is measured from the same timestamp
+            now = time.monotonic()
+            await self._async_request_valve_position(VALVE_OPEN_POSITION, force=True, now=now)
             # Set boost window end
-            self._boost_until = time.monotonic() + DEFAULT_BOOST_DURATION_S
+            self._boost_until = now + DEFAULT_BOOST_DURATION_S
             # Schedule fallback using HA helper; store unsubscribe handle
             try:
                 self._boost_unsub = async_call_later(self.hass, DEFAULT_BOOST_DURATION_S, self._handle_boost_timeout)  # type: ignore[assignment]
@@ -888,7 +1060,10 @@ class SmartTRVClimate(ClimateEntity, RestoreEntity):
 
     async def async_will_remove_from_hass(self) -> None:
         """Cleanup when entity is being removed."""
-        return
+        self._cancel_boost()
+        if self._control_unsub is not None:
+            self._control_unsub()
+            self._control_unsub = None
 
     async def _handle_boost_timeout(self, _now) -> None:
         """Callback for boost timeout to revert to AUTO mode."""
@@ -1,6 +1,7 @@
 """Config flow for Smart TRV Controller integration."""
 from __future__ import annotations
 
+from functools import lru_cache
 from typing import Any
 
 import voluptuous as vol
@@ -31,11 +32,54 @@ from .const import (
 )
 
 
+# Fields whose defaults shape the schema; anything else in the defaults mapping is ignored
+_SCHEMA_FIELDS = (
+    CONF_NAME,
+    CONF_TEMPERATURE_SENSOR,
+    CONF_TRV_ENTITIES,
+    CONF_TARGET_TEMP,
+    CONF_OUTDOOR_TEMPERATURE_SENSOR,
+    CONF_BOILER_FLOW_TEMPERATURE_SENSOR,
+    CONF_IMC_PROCESS_GAIN,
+    CONF_IMC_DEAD_TIME,
+    CONF_IMC_TIME_CONSTANT,
+    CONF_IMC_LAMBDA,
+)
+_MISSING = object()
+
+
 def get_config_schema(
     defaults: dict[str, Any] | None = None,
 ) -> vol.Schema:
-    """Return the config schema."""
+    """Return the config schema.
+
+    Schemas are cached per set of defaults; unhashable defaults bypass the cache.
+    """
     defaults = defaults or {}
+    key = tuple(
+        tuple(value) if isinstance(value, list) else value
+        for value in (defaults.get(field, _MISSING) for field in _SCHEMA_FIELDS)
+    )
+    try:
+        return _cached_config_schema(key)
+    except TypeError:
+        return _build_config_schema(defaults)
+
+
+@lru_cache(maxsize=32)
+def _cached_config_schema(key: tuple[Any, ...]) -> vol.Schema:
+    """Build the schema for a hashable defaults key (see _SCHEMA_FIELDS)."""
+    return _build_config_schema(
+        {
+            field: list(value) if isinstance(value, tuple) else value
+            for field, value in zip(_SCHEMA_FIELDS, key)
+            if value is not _MISSING
+        }
+    )
+
+
+def _build_config_schema(defaults: dict[str, Any]) -> vol.Schema:
+    """Construct the selectors and schema for the given defaults."""
     return vol.Schema(
         {
             vol.Required(
@@ -174,13 +218,13 @@ class SmartTRVOptionsFlow(config_entries.OptionsFlowWithConfigEntry):
         errors: dict[str, str] = {}
 
         if user_input is not None:
-            # Merge with existing data
+            # Merge with existing data; an unchanged save must not trigger the update listener (entry reload)
             new_data = {**self.config_entry.data, **user_input}
-            
-            self.hass.config_entries.async_update_entry(
-                self.config_entry,
-                data=new_data,
-            )
+            if new_data != self.config_entry.data:
+                self.hass.config_entries.async_update_entry(
+                    self.config_entry,
+                    data=new_data,
+                )
             return self.async_create_entry(title="", data={})
 
         return self.async_show_form(
@@ -133,5 +133,18 @@ ATTR_WINDOW_OPEN = "window_open"
 MIN_TEMP_RANGE_C = 0.1
 # Minimum interval between successive window-rate checks to reduce noise amplification
 WINDOW_CHECK_MIN_INTERVAL_S = 30.0
+# Time constant of the first-order low-pass on the window-detection temperature rate (N = 1/60 rad/s)
+WINDOW_RATE_FILTER_TAU_S = 60.0
 # Default boost duration for HVACMode.HEAT (seconds)
 DEFAULT_BOOST_DURATION_S = 15 * 60
+# Sensor-triggered control runs are throttled to at most one per interval (trailing run keeps the latest values)
+CONTROL_MIN_INTERVAL_S = 2.0
+# FF filter step factors are reused while dt stays within this relative tolerance of the cached dt
+FF_ALPHA_DT_REL_TOL = 0.01
+# Re-poll of actual TRV valve readings after a resend of an unchanged command is skipped within this window
+ACTUAL_VALVE_POLL_MIN_INTERVAL_S = 5.0
+# Sensor updates smaller than these are treated as repeats and do not trigger a control run
+SENSOR_TEMP_CHANGE_EPSILON_C = 1e-3
+SENSOR_FF_CHANGE_EPSILON_K = 0.05  # FF inputs are EWMA-filtered and deadbanded downstream
+# Climate state changes reaching the sensors are coalesced: first dispatch immediate, then at most one per cooldown
+SENSOR_DISPATCH_COOLDOWN_S = 0.2
@@ -6,10 +6,13 @@ Exposes four standalone sensors derived from the companion Smart TRV climate ent
 - Temperature Error (°C) = target - room
 - Valve Position (0–255)
 
-Each sensor subscribes to the climate entity state and updates reactively.
+All sensors of a config entry share one subscription to the climate entity state
+(see _ClimateStateDispatcher) and update reactively.
 """
 from __future__ import annotations
 
+import logging
+from collections.abc import Iterable, Mapping
 from typing import Any, Optional
 
 from homeassistant.components.sensor import (
@@ -19,8 +22,9 @@ from homeassistant.components.sensor import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import UnitOfTemperature, ATTR_TEMPERATURE
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import CALLBACK_TYPE, Event, EventStateChangedData, HomeAssistant, State, callback
 from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.debounce import Debouncer
 from homeassistant.helpers.entity import DeviceInfo, EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.event import async_track_state_change_event
@@ -40,15 +44,29 @@ from .const import (
     ATTR_OUTDOOR_FILTERED,
     ATTR_IMC_KC,
     ATTR_IMC_KI,
+    ATTR_WINDOW_OPEN,
     CONF_MAX_TEMP,
     CONF_MIN_TEMP,
     CONF_NAME,
     DEFAULT_MAX_TEMP,
     DEFAULT_MIN_TEMP,
     DOMAIN,
+    SENSOR_DISPATCH_COOLDOWN_S,
     VALVE_OPEN_POSITION,
 )
 
+_LOGGER = logging.getLogger(__name__)
+
+_MISSING = object()
+# Attribute values accepted as numbers
+_NUMERIC: tuple[type, ...] = (int, float)
+
+
+def _to_float(attrs: Mapping[str, Any], key: str) -> float | None:
+    """Return attribute `key` as float if it is an int/float (bools excluded), else None."""
+    v = attrs.get(key)
+    return float(v) if isinstance(v, _NUMERIC) and not isinstance(v, bool) else None
+
 
 def _resolve_climate_entity_id(hass: HomeAssistant, entry: ConfigEntry) -> Optional[str]:
     registry = er.async_get(hass)
@@ -56,50 +74,132 @@ def _resolve_climate_entity_id(hass: HomeAssistant, entry: ConfigEntry) -> Optio
     return registry.async_get_entity_id("climate", DOMAIN, climate_unique_id)
 
 
+class _ClimateStateDispatcher:
+    """One state-change subscription on the companion climate entity, fanned out to an entry's sensors."""
+
+    __slots__ = ("_hass", "climate_entity_id", "_sensors", "_by_attr", "_last_attrs", "_latest_state", "_debouncer")
+
+    def __init__(self, hass: HomeAssistant, climate_entity_id: Optional[str]) -> None:
+        self._hass = hass
+        self.climate_entity_id = climate_entity_id
+        self._sensors: list[_BaseSmartSensor] = []
+        # Climate attribute -> sensors deriving their value from it; only those are updated when it changes
+        self._by_attr: dict[str, list[_BaseSmartSensor]] = {}
+        # Attributes of the last dispatched state (None: next dispatch goes to all sensors)
+        self._last_attrs: Mapping[str, Any] | None = None
+        # Newest climate state; a burst of events within the cooldown collapses into one trailing dispatch
+        self._latest_state: State | None = None
+        self._debouncer = Debouncer(
+            hass, _LOGGER, cooldown=SENSOR_DISPATCH_COOLDOWN_S, immediate=True, function=self._async_dispatch_latest
+        )
+
+    @callback
+    def async_start(self) -> CALLBACK_TYPE:
+        """Subscribe to the climate entity; returns a callable that unsubscribes and stops the debouncer."""
+        unsub = async_track_state_change_event(self._hass, [self.climate_entity_id], self._async_state_changed)
+
+        @callback
+        def _stop() -> None:
+            unsub()
+            self._debouncer.async_shutdown()
+
+        return _stop
+
+    @callback
+    def async_add(self, sensor: _BaseSmartSensor) -> CALLBACK_TYPE:
+        """Register a sensor for updates; returns a callable that unregisters it."""
+        self._sensors.append(sensor)
+        keys = sensor._watched_attributes()
+        for key in keys:
+            self._by_attr.setdefault(key, []).append(sensor)
+
+        @callback
+        def _remove() -> None:
+            self._sensors.remove(sensor)
+            for key in keys:
+                self._by_attr[key].remove(sensor)
+
+        return _remove
+
+    @callback
+    def _async_state_changed(self, event: Event[EventStateChangedData]) -> None:
+        self._latest_state = event.data["new_state"]
+        self._debouncer.async_schedule_call()
+
+    @callback
+    def _async_dispatch_latest(self) -> None:
+        new_state = self._latest_state
+        last = self._last_attrs
+        if new_state is None or last is None:
+            # Entity gone or first dispatch: nothing to diff against
+            targets: Iterable[_BaseSmartSensor] = tuple(self._sensors)
+        else:
+            attrs = new_state.attributes
+            changed = [k for k, v in attrs.items() if last.get(k, _MISSING) != v]
+            changed.extend(k for k in last if k not in attrs)
+            # A sensor watching several changed attributes is updated once
+            targets = dict.fromkeys(sensor for key in changed for sensor in self._by_attr.get(key, ()))
+        self._last_attrs = new_state.attributes if new_state is not None else None
+        for sensor in targets:
+            sensor._apply(new_state)
+
+
 class _BaseSmartSensor(SensorEntity):
     """Base class that follows a companion climate entity and derives a value."""
 
     _attr_has_entity_name = True
 
-    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+    # Own state lives in slots (Entity base classes still provide a __dict__ for HA's own attributes)
+    __slots__ = ("_entry", "_name", "_dispatcher", "_climate_entity_id", "_native_value")
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry, dispatcher: _ClimateStateDispatcher | None = None) -> None:
         self.hass = hass
         self._entry = entry
         self._name = entry.data.get(CONF_NAME, "Smart TRV")
-        self._climate_entity_id: Optional[str] = None
-        self._unsub = None
+        self._dispatcher = dispatcher
+        self._climate_entity_id: Optional[str] = dispatcher.climate_entity_id if dispatcher is not None else None
         self._attr_device_info = DeviceInfo(
             identifiers={(DOMAIN, entry.entry_id)},
             name=self._name,
         )
         self._native_value: Any = None
 
+    # Climate attributes this sensor derives its state from (dispatch index)
+    _watched_attrs: tuple[str, ...] = ()
+
     @property
     def native_value(self) -> Any:
         return self._native_value
 
+    def _watched_attributes(self) -> tuple[str, ...]:
+        return self._watched_attrs
+
     async def async_added_to_hass(self) -> None:
         await super().async_added_to_hass()
-        self._climate_entity_id = _resolve_climate_entity_id(self.hass, self._entry)
-        if self._climate_entity_id:
-            self._unsub = async_track_state_change_event(
-                self.hass, [self._climate_entity_id], self._handle_climate_state_change
-            )
-        await self._update_from_climate_state()
-
-    async def async_will_remove_from_hass(self) -> None:
-        if callable(self._unsub):
-            try:
-                self._unsub()
-            except Exception:  # pragma: no cover - defensive
-                pass
-        self._unsub = None
+        if self._dispatcher is not None:
+            self.async_on_remove(self._dispatcher.async_add(self))
+        # HA writes the initial state right after this hook returns
+        self._recompute(self.hass.states.get(self._climate_entity_id) if self._climate_entity_id else None)
 
     @callback
-    def _handle_climate_state_change(self, _event) -> None:
-        self.hass.async_create_task(self._update_from_climate_state())
+    def _apply(self, new_state: State | None) -> None:
+        """Handle a climate state change delivered by the shared dispatcher.
+
+        The state is only written when the published values changed, so an event that moves
+        other controller attributes does not fire a state_changed event for this sensor.
+        """
+        previous = self._published_state()
+        self._recompute(new_state)
+        if self._published_state() != previous:
+            self.async_write_ha_state()
+
+    def _published_state(self) -> Any:
+        """Return the values this sensor publishes (compared to skip no-op writes)."""
+        return self._native_value
 
-    async def _update_from_climate_state(self) -> None:
-        """Implemented by subclasses to compute native value from climate state."""
+    @callback
+    def _recompute(self, st: State | None) -> None:
+        """Implemented by subclasses to compute native value from the climate state (None if missing)."""
         raise NotImplementedError
 
 
@@ -109,11 +209,18 @@ class SmartTRVSetpointSensor(_BaseSmartSensor):
     _attr_device_class = SensorDeviceClass.TEMPERATURE
     _attr_state_class = SensorStateClass.MEASUREMENT
     _attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
+    _watched_attrs = (ATTR_VALVE_POSITION, ATTR_TEMPERATURE, ATTR_ROOM_TEMPERATURE)
+
+    __slots__ = (
+        "_min_temp", "_max_temp", "_scale", "_actual_setpoint", "_room_temperature", "_latest_valve_position", "_attrs_cache",
+    )
 
-    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
-        super().__init__(hass, entry)
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry, dispatcher: _ClimateStateDispatcher | None = None) -> None:
+        super().__init__(hass, entry, dispatcher)
         self._min_temp: float = entry.data.get(CONF_MIN_TEMP, DEFAULT_MIN_TEMP)
         self._max_temp: float = entry.data.get(CONF_MAX_TEMP, DEFAULT_MAX_TEMP)
+        # °C per valve step (0–255), fixed for the entity's lifetime
+        self._scale: float = max(0.0, self._max_temp - self._min_temp) / float(VALVE_OPEN_POSITION)
         self._attr_unique_id = f"{DOMAIN}_{entry.entry_id}_setpoint"
         self._attr_name = f"{self._name} Setpoint"
 
@@ -121,44 +228,43 @@ class SmartTRVSetpointSensor(_BaseSmartSensor):
         self._actual_setpoint: float | None = None
         self._room_temperature: float | None = None
         self._latest_valve_position: int | None = None
+        # Attributes are rebuilt per update (into the same dict), not per property read
+        self._attrs_cache: dict[str, Any] = {}
 
-    async def _update_from_climate_state(self) -> None:  # type: ignore[override]
-        st = self.hass.states.get(self._climate_entity_id) if self._climate_entity_id else None
+    @callback
+    def _recompute(self, st: State | None) -> None:
         valve_pos: int | None = None
         actual_target: float | None = None
         room_temp: float | None = None
         if st is not None:
-            vp = st.attributes.get(ATTR_VALVE_POSITION)
-            if isinstance(vp, (int, float)):
+            attrs = st.attributes
+            vp = _to_float(attrs, ATTR_VALVE_POSITION)
+            if vp is not None:
                 valve_pos = int(vp)
-            tp = st.attributes.get(ATTR_TEMPERATURE)
-            if isinstance(tp, (int, float)):
-                actual_target = float(tp)
-            rt = st.attributes.get(ATTR_ROOM_TEMPERATURE)
-            if isinstance(rt, (int, float)):
-                room_temp = float(rt)
-
-        if valve_pos is None:
-            self._native_value = None
-        else:
-            span = max(0.0, self._max_temp - self._min_temp)
-            self._native_value = self._min_temp + (valve_pos / float(VALVE_OPEN_POSITION)) * span
+            actual_target = _to_float(attrs, ATTR_TEMPERATURE)
+            room_temp = _to_float(attrs, ATTR_ROOM_TEMPERATURE)
+
+        self._native_value = None if valve_pos is None else self._min_temp + valve_pos * self._scale
 
         self._actual_setpoint = actual_target
         self._room_temperature = room_temp
         self._latest_valve_position = valve_pos
-        self.async_write_ha_state()
+
+        attrs = self._attrs_cache
+        attrs.clear()
+        if actual_target is not None:
+            attrs["target_temperature"] = actual_target
+            if room_temp is not None:
+                attrs["error"] = actual_target - room_temp
+        if valve_pos is not None:
+            attrs["target_valve_position"] = valve_pos
+
+    def _published_state(self) -> Any:
+        return self._native_value, self._actual_setpoint, self._room_temperature, self._latest_valve_position
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
-        attrs: dict[str, Any] = {}
-        if self._actual_setpoint is not None:
-            attrs["target_temperature"] = self._actual_setpoint
-        if self._actual_setpoint is not None and self._room_temperature is not None:
-            attrs["error"] = float(self._actual_setpoint - self._room_temperature)
-        if self._latest_valve_position is not None:
-            attrs["target_valve_position"] = int(self._latest_valve_position)
-        return attrs
+        return self._attrs_cache
 
 
 class SmartTRVTargetTemperatureSensor(_BaseSmartSensor):
@@ -167,21 +273,16 @@ class SmartTRVTargetTemperatureSensor(_BaseSmartSensor):
     _attr_device_class = SensorDeviceClass.TEMPERATURE
     _attr_state_class = SensorStateClass.MEASUREMENT
     _attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
+    _watched_attrs = (ATTR_TEMPERATURE,)
 
-    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
-        super().__init__(hass, entry)
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry, dispatcher: _ClimateStateDispatcher | None = None) -> None:
+        super().__init__(hass, entry, dispatcher)
         self._attr_unique_id = f"{DOMAIN}_{entry.entry_id}_target_temperature"
         self._attr_name = f"{self._name} Target Temperature"
 
-    async def _update_from_climate_state(self) -> None:  # type: ignore[override]
-        st = self.hass.states.get(self._climate_entity_id) if self._climate_entity_id else None
-        val: float | None = None
-        if st is not None:
-            tp = st.attributes.get(ATTR_TEMPERATURE)
-            if isinstance(tp, (int, float)):
-                val = float(tp)
-        self._native_value = val
-        self.async_write_ha_state()
+    @callback
+    def _recompute(self, st: State | None) -> None:
+        self._native_value = _to_float(st.attributes, ATTR_TEMPERATURE) if st is not None else None
 
 
 class SmartTRVTemperatureErrorSensor(_BaseSmartSensor):
@@ -190,43 +291,40 @@ class SmartTRVTemperatureErrorSensor(_BaseSmartSensor):
     _attr_device_class = SensorDeviceClass.TEMPERATURE
     _attr_state_class = SensorStateClass.MEASUREMENT
     _attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
+    _watched_attrs = (ATTR_TEMPERATURE, ATTR_ROOM_TEMPERATURE)
 
-    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
-        super().__init__(hass, entry)
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry, dispatcher: _ClimateStateDispatcher | None = None) -> None:
+        super().__init__(hass, entry, dispatcher)
         self._attr_unique_id = f"{DOMAIN}_{entry.entry_id}_temperature_error"
         self._attr_name = f"{self._name} Temperature Error"
 
-    async def _update_from_climate_state(self) -> None:  # type: ignore[override]
-        st = self.hass.states.get(self._climate_entity_id) if self._climate_entity_id else None
+    @callback
+    def _recompute(self, st: State | None) -> None:
         val: float | None = None
         if st is not None:
-            tp = st.attributes.get(ATTR_TEMPERATURE)
-            rt = st.attributes.get(ATTR_ROOM_TEMPERATURE)
-            if isinstance(tp, (int, float)) and isinstance(rt, (int, float)):
-                val = float(tp) - float(rt)
+            attrs = st.attributes
+            tp = _to_float(attrs, ATTR_TEMPERATURE)
+            rt = _to_float(attrs, ATTR_ROOM_TEMPERATURE)
+            if tp is not None and rt is not None:
+                val = tp - rt
         self._native_value = val
-        self.async_write_ha_state()
 
 
 class SmartTRVValvePositionSensor(_BaseSmartSensor):
     """Current calculated valve position (0–255)."""
 
     _attr_state_class = SensorStateClass.MEASUREMENT
+    _watched_attrs = (ATTR_VALVE_POSITION,)
 
-    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
-        super().__init__(hass, entry)
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry, dispatcher: _ClimateStateDispatcher | None = None) -> None:
+        super().__init__(hass, entry, dispatcher)
         self._attr_unique_id = f"{DOMAIN}_{entry.entry_id}_valve_position"
         self._attr_name = f"{self._name} Valve Position"
 
-    async def _update_from_climate_state(self) -> None:  # type: ignore[override]
-        st = self.hass.states.get(self._climate_entity_id) if self._climate_entity_id else None
-        val: int | None = None
-        if st is not None:
-            vp = st.attributes.get(ATTR_VALVE_POSITION)
-            if isinstance(vp, (int, float)):
-                val = int(vp)
-        self._native_value = val
-        self.async_write_ha_state()
+    @callback
+    def _recompute(self, st: State | None) -> None:
+        vp = _to_float(st.attributes, ATTR_VALVE_POSITION) if st is not None else None
+        self._native_value = int(vp) if vp is not None else None
 
 
 class SmartTRVActualValvePositionSensor(_BaseSmartSensor):
@@ -234,199 +332,129 @@ class SmartTRVActualValvePositionSensor(_BaseSmartSensor):
 
     _attr_state_class = SensorStateClass.MEASUREMENT
     _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _watched_attrs = (ATTR_ACTUAL_VALVE_POSITION,)
 
-    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
-        super().__init__(hass, entry)
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry, dispatcher: _ClimateStateDispatcher | None = None) -> None:
+        super().__init__(hass, entry, dispatcher)
         self._attr_unique_id = f"{DOMAIN}_{entry.entry_id}_actual_valve_position"
         self._attr_name = f"{self._name} Actual Valve Position"
 
-    async def _update_from_climate_state(self) -> None:  # type: ignore[override]
-        st = self.hass.states.get(self._climate_entity_id) if self._climate_entity_id else None
-        val: int | None = None
-        if st is not None:
-            vp = st.attributes.get(ATTR_ACTUAL_VALVE_POSITION)
-            if isinstance(vp, (int, float)):
-                val = int(vp)
-        self._native_value = val
-        self.async_write_ha_state()
+    @callback
+    def _recompute(self, st: State | None) -> None:
+        vp = _to_float(st.attributes, ATTR_ACTUAL_VALVE_POSITION) if st is not None else None
+        self._native_value = int(vp) if vp is not None else None
 
 
 class _AttrMirrorSensor(_BaseSmartSensor):
-    """Base for simple 1:1 attribute mirror sensors."""
+    """Simple 1:1 mirror of a numeric climate attribute (diagnostic); configured from _MIRROR_SPECS."""
 
     _attr_state_class = SensorStateClass.MEASUREMENT
     _attr_device_class = None
     _attr_native_unit_of_measurement = None
     _attr_entity_category = EntityCategory.DIAGNOSTIC
 
-    def __init__(self, hass: HomeAssistant, entry: ConfigEntry, attr_key: str, name_suffix: str, unique_suffix: str) -> None:
-        super().__init__(hass, entry)
-        self._attr_key = attr_key
+    __slots__ = ("_source_attr",)
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        attr_key: str,
+        name_suffix: str,
+        unique_suffix: str,
+        device_class: SensorDeviceClass | None = None,
+        unit: str | None = None,
+        dispatcher: _ClimateStateDispatcher | None = None,
+    ) -> None:
+        super().__init__(hass, entry, dispatcher)
+        self._source_attr = attr_key
         self._attr_unique_id = f"{DOMAIN}_{entry.entry_id}_{unique_suffix}"
         self._attr_name = f"{self._name} {name_suffix}"
+        if device_class is not None:
+            self._attr_device_class = device_class
+        if unit is not None:
+            self._attr_native_unit_of_measurement = unit
 
-    async def _update_from_climate_state(self) -> None:  # type: ignore[override]
-        st = self.hass.states.get(self._climate_entity_id) if self._climate_entity_id else None
-        val = None
-        if st is not None:
-            raw = st.attributes.get(self._attr_key)
-            if isinstance(raw, (int, float)):
-                val = float(raw)
-        self._native_value = val
-        self.async_write_ha_state()
-
-
-class SmartTRVDesiredValveSensor(_AttrMirrorSensor):
-    """Desired valve position requested by controller (0–255)."""
-
-    _attr_entity_category = EntityCategory.DIAGNOSTIC
-
-    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
-        super().__init__(hass, entry, ATTR_DESIRED_VALVE_POSITION, "Desired Valve", "desired_valve_position")
-
-
-class SmartTRVUtotalSensor(_AttrMirrorSensor):
-    """Total controller output u in [0,1]."""
-
-    _attr_entity_category = EntityCategory.DIAGNOSTIC
-
-    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
-        super().__init__(hass, entry, ATTR_U_TOTAL, "Controller u Total", "u_total")
-
-
-class SmartTRVUpiSensor(_AttrMirrorSensor):
-    """PI controller output (before FF) in [0,1]."""
-
-    _attr_entity_category = EntityCategory.DIAGNOSTIC
-
-    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
-        super().__init__(hass, entry, ATTR_U_PI, "Controller u PI", "u_pi")
-
-
-class SmartTRVUiSensor(_AttrMirrorSensor):
-    """Integral-only contribution to PI output in [0,1]."""
-
-    _attr_entity_category = EntityCategory.DIAGNOSTIC
-
-    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
-        super().__init__(hass, entry, ATTR_U_I, "Controller u I", "u_i")
-
-
-class SmartTRVUffSensor(_AttrMirrorSensor):
-    """Feed-forward term (after smoothing/deadband)."""
-
-    _attr_entity_category = EntityCategory.DIAGNOSTIC
-
-    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
-        super().__init__(hass, entry, ATTR_U_FF, "FF", "u_ff")
-
-
-class SmartTRVFilteredFlowTempSensor(_AttrMirrorSensor):
-    """Filtered boiler flow temperature (°C)."""
-
-    _attr_device_class = SensorDeviceClass.TEMPERATURE
-    _attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
-    _attr_entity_category = EntityCategory.DIAGNOSTIC
-
-    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
-        super().__init__(hass, entry, ATTR_FLOW_FILTERED, "Flow Temp (filtered)", "flow_filtered")
-
-
-class SmartTRVFilteredOutdoorTempSensor(_AttrMirrorSensor):
-    """Filtered outdoor temperature (°C)."""
+    def _watched_attributes(self) -> tuple[str, ...]:
+        return (self._source_attr,)
 
-    _attr_device_class = SensorDeviceClass.TEMPERATURE
-    _attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
-    _attr_entity_category = EntityCategory.DIAGNOSTIC
-
-    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
-        super().__init__(hass, entry, ATTR_OUTDOOR_FILTERED, "Outdoor Temp (filtered)", "outdoor_filtered")
-
-
-class SmartTRVErrorCSensor(_AttrMirrorSensor):
-    """Controller temperature error (°C)."""
-
-    _attr_device_class = SensorDeviceClass.TEMPERATURE
-    _attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
-    _attr_entity_category = EntityCategory.DIAGNOSTIC
-
-    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
-        super().__init__(hass, entry, ATTR_ERROR_C, "Error (°C)", "error_c")
-
-
-class SmartTRVErrorNormSensor(_AttrMirrorSensor):
-    """Normalized temperature error [0,1]."""
-
-    _attr_entity_category = EntityCategory.DIAGNOSTIC
-
-    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
-        super().__init__(hass, entry, ATTR_ERROR_NORM, "Error (norm)", "error_norm")
-
-
-class SmartTRVImcKcSensor(_AttrMirrorSensor):
-    """IMC proportional gain (unitless)."""
-
-    _attr_entity_category = EntityCategory.DIAGNOSTIC
-
-    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
-        super().__init__(hass, entry, ATTR_IMC_KC, "IMC Kc", "imc_kc")
-
-
-class SmartTRVImcKiSensor(_AttrMirrorSensor):
-    """IMC integral gain (per second)."""
-
-    _attr_entity_category = EntityCategory.DIAGNOSTIC
-
-    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
-        super().__init__(hass, entry, ATTR_IMC_KI, "IMC Ki", "imc_ki")
+    @callback
+    def _recompute(self, st: State | None) -> None:
+        self._native_value = _to_float(st.attributes, self._source_attr) if st is not None else None
+
+
+# (attr_key, name_suffix, unique_suffix, device_class, unit) per mirrored controller diagnostic
+_MIRROR_SPECS: tuple[tuple[str, str, str, SensorDeviceClass | None, str | None], ...] = (
+    # Desired valve position requested by controller (0–255)
+    (ATTR_DESIRED_VALVE_POSITION, "Desired Valve", "desired_valve_position", None, None),
+    # PI controller output (before FF) in [0,1]
+    (ATTR_U_PI, "Controller u PI", "u_pi", None, None),
+    # Integral-only contribution to PI output in [0,1]
+    (ATTR_U_I, "Controller u I", "u_i", None, None),
+    # Feed-forward term (after smoothing/deadband)
+    (ATTR_U_FF, "FF", "u_ff", None, None),
+    # Total controller output u in [0,1]
+    (ATTR_U_TOTAL, "Controller u Total", "u_total", None, None),
+    # Filtered boiler flow temperature (°C)
+    (ATTR_FLOW_FILTERED, "Flow Temp (filtered)", "flow_filtered", SensorDeviceClass.TEMPERATURE, UnitOfTemperature.CELSIUS),
+    # Filtered outdoor temperature (°C)
+    (ATTR_OUTDOOR_FILTERED, "Outdoor Temp (filtered)", "outdoor_filtered", SensorDeviceClass.TEMPERATURE, UnitOfTemperature.CELSIUS),
+    # Controller temperature error (°C)
+    (ATTR_ERROR_C, "Error (°C)", "error_c", SensorDeviceClass.TEMPERATURE, UnitOfTemperature.CELSIUS),
+    # Normalized temperature error [0,1]
+    (ATTR_ERROR_NORM, "Error (norm)", "error_norm", None, None),
+    # IMC proportional gain (unitless)
+    (ATTR_IMC_KC, "IMC Kc", "imc_kc", None, None),
+    # IMC integral gain (per second)
+    (ATTR_IMC_KI, "IMC Ki", "imc_ki", None, None),
+)
 
 
 class SmartTRVWindowOpenSensor(_BaseSmartSensor):
     """Mirror of window_open diagnostic (boolean)."""
 
     _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _watched_attrs = (ATTR_WINDOW_OPEN,)
 
-    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
-        super().__init__(hass, entry)
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry, dispatcher: _ClimateStateDispatcher | None = None) -> None:
+        super().__init__(hass, entry, dispatcher)
         self._attr_unique_id = f"{DOMAIN}_{entry.entry_id}_window_open"
         self._attr_name = f"{self._name} Window Open"
 
-    async def _update_from_climate_state(self) -> None:  # type: ignore[override]
-        st = self.hass.states.get(self._climate_entity_id) if self._climate_entity_id else None
+    @callback
+    def _recompute(self, st: State | None) -> None:
         val: bool | None = None
         if st is not None:
-            raw = st.attributes.get("window_open")
+            raw = st.attributes.get(ATTR_WINDOW_OPEN)
             if isinstance(raw, bool):
                 val = raw
-            elif isinstance(raw, (int, float)):
+            elif isinstance(raw, _NUMERIC):
                 # interpret nonzero as True
                 val = bool(raw)
         self._native_value = val
-        self.async_write_ha_state()
 
 
 async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
 ) -> None:
     """Set up Smart TRV sensors from a config entry."""
+    # One climate-state subscription per entry, shared by all sensors below
+    dispatcher = _ClimateStateDispatcher(hass, _resolve_climate_entity_id(hass, entry))
+    if dispatcher.climate_entity_id:
+        entry.async_on_unload(dispatcher.async_start())
+
     entities: list[SensorEntity] = [
-        SmartTRVSetpointSensor(hass, entry),
-        SmartTRVTargetTemperatureSensor(hass, entry),
-        SmartTRVTemperatureErrorSensor(hass, entry),
-        SmartTRVValvePositionSensor(hass, entry),
-        SmartTRVActualValvePositionSensor(hass, entry),
+        SmartTRVSetpointSensor(hass, entry, dispatcher),
+        SmartTRVTargetTemperatureSensor(hass, entry, dispatcher),
+        SmartTRVTemperatureErrorSensor(hass, entry, dispatcher),
+        SmartTRVValvePositionSensor(hass, entry, dispatcher),
+        SmartTRVActualValvePositionSensor(hass, entry, dispatcher),
         # Diagnostics
-        SmartTRVDesiredValveSensor(hass, entry),
-        SmartTRVUpiSensor(hass, entry),
-        SmartTRVUiSensor(hass, entry),
-        SmartTRVUffSensor(hass, entry),
-        SmartTRVUtotalSensor(hass, entry),
-        SmartTRVFilteredFlowTempSensor(hass, entry),
-        SmartTRVFilteredOutdoorTempSensor(hass, entry),
-        SmartTRVErrorCSensor(hass, entry),
-        SmartTRVErrorNormSensor(hass, entry),
-        SmartTRVImcKcSensor(hass, entry),
-        SmartTRVImcKiSensor(hass, entry),
-        SmartTRVWindowOpenSensor(hass, entry),
+        *(
+            _AttrMirrorSensor(hass, entry, attr_key, name_suffix, unique_suffix, device_class, unit, dispatcher)
+            for attr_key, name_suffix, unique_suffix, device_class, unit in _MIRROR_SPECS
+        ),
+        SmartTRVWindowOpenSensor(hass, entry, dispatcher),
     ]
-    async_add_entities(entities, True)
+    # No update_before_add: the sensors have no async_update and derive their state in async_added_to_hass
+    async_add_entities(entities)
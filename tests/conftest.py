@@ -1,14 +1,14 @@
 """Fixtures for Smart TRV Controller tests."""
 from __future__ import annotations
 
-from collections.abc import Generator
+from collections.abc import Callable
+from types import MappingProxyType, SimpleNamespace
 from typing import Any
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
 from homeassistant.components.climate import HVACMode
-from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_NAME, STATE_UNAVAILABLE
 from homeassistant.core import HomeAssistant, State
 
@@ -30,11 +30,44 @@ from custom_components.smart_trv.const import (
     DOMAIN,
 )
 
-
-@pytest.fixture
-def hass() -> Generator[MagicMock, None, None]:
-    """Create a mock Home Assistant instance."""
-    hass = MagicMock(spec=HomeAssistant)
+# MagicMock(spec=cls) runs dir(cls) on every call; compute the specs once.
+_HASS_SPEC = dir(HomeAssistant)
+_STATE_SPEC = dir(State)
+
+
+# Entry data is only ever read, so build it once and share it read-only
+_ENTRY_DATA = MappingProxyType({
+    CONF_NAME: "Test Smart TRV",
+    CONF_TEMPERATURE_SENSOR: "sensor.room_temperature",
+    CONF_TRV_ENTITIES: ["climate.trv_living_room", "climate.trv_bedroom"],
+    CONF_MIN_TEMP: DEFAULT_MIN_TEMP,
+    CONF_MAX_TEMP: DEFAULT_MAX_TEMP,
+    CONF_TARGET_TEMP: DEFAULT_TARGET_TEMP,
+    CONF_PRECISION: DEFAULT_PRECISION,
+    # IMC parameters (deterministic for tests)
+    CONF_IMC_PROCESS_GAIN: 4.0,
+    CONF_IMC_TIME_CONSTANT: 5400.0,
+    CONF_IMC_DEAD_TIME: 900.0,
+    # Leave lambda unset to default to tau
+    # CONF_IMC_LAMBDA: 5400.0,
+})
+
+
+def _make_entry(entry_id: str, name: str) -> SimpleNamespace:
+    """Build a stub config entry; the mocks are fresh so call assertions stay per-test."""
+    data = _ENTRY_DATA if name == _ENTRY_DATA[CONF_NAME] else {**_ENTRY_DATA, CONF_NAME: name}
+    return SimpleNamespace(
+        entry_id=entry_id,
+        data=data,
+        options={},
+        async_on_unload=MagicMock(),
+        add_update_listener=MagicMock(),
+    )
+
+
+def _build_hass() -> MagicMock:
+    """Build a fresh mock Home Assistant instance (mocks are never shared between tests)."""
+    hass = MagicMock(spec=_HASS_SPEC)
     hass.data = {}
     hass.states = MagicMock()
     hass.services = MagicMock()
@@ -49,29 +82,27 @@ def hass() -> Generator[MagicMock, None, None]:
 
 
 @pytest.fixture
-def mock_config_entry() -> ConfigEntry:
-    """Create a mock config entry."""
-    entry = MagicMock(spec=ConfigEntry)
-    entry.entry_id = "test_entry_id"
-    entry.data = {
-        CONF_NAME: "Test Smart TRV",
-        CONF_TEMPERATURE_SENSOR: "sensor.room_temperature",
-        CONF_TRV_ENTITIES: ["climate.trv_living_room", "climate.trv_bedroom"],
-        CONF_MIN_TEMP: DEFAULT_MIN_TEMP,
-        CONF_MAX_TEMP: DEFAULT_MAX_TEMP,
-        CONF_TARGET_TEMP: DEFAULT_TARGET_TEMP,
-        CONF_PRECISION: DEFAULT_PRECISION,
-        # IMC parameters (deterministic for tests)
-        CONF_IMC_PROCESS_GAIN: 4.0,
-        CONF_IMC_TIME_CONSTANT: 5400.0,
-        CONF_IMC_DEAD_TIME: 900.0,
-        # Leave lambda unset to default to tau
-        # CONF_IMC_LAMBDA: 5400.0,
-    }
-    entry.options = {}
-    entry.add_update_listener = MagicMock()
-    entry.async_on_unload = MagicMock()
-    return entry
+def hass() -> MagicMock:
+    """Create a mock Home Assistant instance."""
+    return _build_hass()
+
+
+@pytest.fixture
+def mock_config_entry() -> SimpleNamespace:
+    """Create a stub config entry."""
+    return _make_entry("test_entry_id", "Test Smart TRV")
+
+
+@pytest.fixture(name="config_entry")
+def _config_entry_alias(mock_config_entry: SimpleNamespace) -> SimpleNamespace:
+    """Alias used by the sensor tests."""
+    return mock_config_entry
+
+
+@pytest.fixture
+def make_entry() -> Callable[[str, str], SimpleNamespace]:
+    """Return the entry factory, for tests that set up several entries."""
+    return _make_entry
 
 
 @pytest.fixture
@@ -95,7 +126,7 @@ def mock_config_data() -> dict[str, Any]:
 @pytest.fixture
 def mock_temperature_state() -> State:
     """Create a mock temperature sensor state."""
-    state = MagicMock(spec=State)
+    state = MagicMock(spec=_STATE_SPEC)
     state.state = "20.0"
     state.attributes = {}
     return state
@@ -104,7 +135,7 @@ def mock_temperature_state() -> State:
 @pytest.fixture
 def mock_trv_state() -> State:
     """Create a mock TRV state."""
-    state = MagicMock(spec=State)
+    state = MagicMock(spec=_STATE_SPEC)
     state.state = HVACMode.HEAT
     state.attributes = {}
     return state
@@ -113,7 +144,7 @@ def mock_trv_state() -> State:
 @pytest.fixture
 def mock_unavailable_state() -> State:
     """Create a mock unavailable state."""
-    state = MagicMock(spec=State)
+    state = MagicMock(spec=_STATE_SPEC)
     state.state = STATE_UNAVAILABLE
     state.attributes = {}
     return state
@@ -122,7 +153,7 @@ def mock_unavailable_state() -> State:
 @pytest.fixture
 def mock_last_state() -> State:
     """Create a mock last state for restore."""
-    state = MagicMock(spec=State)
+    state = MagicMock(spec=_STATE_SPEC)
     state.state = HVACMode.HEAT
     state.attributes = {"temperature": 21.0}
     return state
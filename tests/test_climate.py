@@ -1,6 +1,10 @@
 """Tests for Smart TRV Controller climate entity."""
 from __future__ import annotations
 
+import logging
+from collections.abc import Mapping
+from dataclasses import replace
+from types import MappingProxyType, SimpleNamespace
 from typing import Any
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -37,50 +41,92 @@ from custom_components.smart_trv.const import (
     DEFAULT_TARGET_TEMP,
     DOMAIN,
     VALVE_CLOSED_POSITION,
+    VALVE_MIN_STEP,
     VALVE_OPEN_POSITION,
 )
 
+# Introspecting HomeAssistant for spec= dominates fixture cost; do it once.
+_HASS_SPEC = dir(HomeAssistant)
+
+
+def _state(state: str, attributes: dict[str, Any] | None = None) -> SimpleNamespace:
+    """Return a minimal stand-in for a State; the controller only reads these two fields."""
+    return SimpleNamespace(state=state, attributes=attributes or {})
+
+
+class _ServiceCalls:
+    """Cheap awaitable stand-in for services.async_call.
+
+    Keeps the two MagicMock attributes the tests use: call_args_list holds
+    (args, kwargs) pairs and side_effect, when set, is raised on each call.
+    """
+
+    __slots__ = ("call_args_list", "side_effect")
+
+    def __init__(self) -> None:
+        self.call_args_list: list[tuple[tuple[Any, ...], dict[str, Any]]] = []
+        self.side_effect: BaseException | None = None
+
+    async def __call__(self, *args: Any, **kwargs: Any) -> None:
+        self.call_args_list.append((args, kwargs))
+        if self.side_effect is not None:
+            raise self.side_effect
+
+
+# The state-change callbacks ignore their event argument; share one inert stand-in.
+_EVENT = SimpleNamespace(data={})
+
+# What states.get returns unless a test says otherwise: a valid room temperature.
+_DEFAULT_TEMP_STATE = _state("20.0")
+
 
 @pytest.fixture
 def mock_hass() -> MagicMock:
     """Create a mock Home Assistant instance."""
-    hass = MagicMock(spec=HomeAssistant)
+    hass = MagicMock(spec=_HASS_SPEC)
     hass.data = {}
     hass.states = MagicMock()
+    hass.states.get.return_value = _DEFAULT_TEMP_STATE
     hass.services = MagicMock()
-    hass.services.async_call = AsyncMock()
-    hass.async_create_task = MagicMock(side_effect=lambda coro: coro)
+    hass.services.async_call = _ServiceCalls()
+    # Pass-through; tests that count scheduled tasks install a recording mock
+    hass.async_create_task = lambda coro: coro
     return hass
 
 
+# Shared read-only; tests needing variants build dict(_MOCK_CONFIG, ...).
+_MOCK_CONFIG: Mapping[str, Any] = MappingProxyType({
+    CONF_NAME: "Test Smart TRV",
+    CONF_TEMPERATURE_SENSOR: "sensor.room_temperature",
+    CONF_TRV_ENTITIES: ["climate.trv_living_room", "climate.trv_bedroom", "climate.trv_kids_room_left", "climate.trv_kids_room_right"],
+    CONF_MIN_TEMP: DEFAULT_MIN_TEMP,
+    CONF_MAX_TEMP: DEFAULT_MAX_TEMP,
+    CONF_TARGET_TEMP: DEFAULT_TARGET_TEMP,
+    CONF_PRECISION: DEFAULT_PRECISION,
+    # IMC parameters for deterministic gains
+    "imc_process_gain": 4.0,
+    "imc_time_constant": 5400.0,
+    "imc_dead_time": 900.0,
+})
+
+
 @pytest.fixture
-def mock_config() -> dict[str, Any]:
-    """Create mock configuration."""
-    return {
-        CONF_NAME: "Test Smart TRV",
-        CONF_TEMPERATURE_SENSOR: "sensor.room_temperature",
-        CONF_TRV_ENTITIES: ["climate.trv_living_room", "climate.trv_bedroom", "climate.trv_kids_room_left", "climate.trv_kids_room_right"],
-        CONF_MIN_TEMP: DEFAULT_MIN_TEMP,
-        CONF_MAX_TEMP: DEFAULT_MAX_TEMP,
-        CONF_TARGET_TEMP: DEFAULT_TARGET_TEMP,
-        CONF_PRECISION: DEFAULT_PRECISION,
-        # IMC parameters for deterministic gains
-        "imc_process_gain": 4.0,
-        "imc_time_constant": 5400.0,
-        "imc_dead_time": 900.0,
-    }
+def mock_config() -> Mapping[str, Any]:
+    """Return the shared mock configuration."""
+    return _MOCK_CONFIG
 
 
 @pytest.fixture
 def climate_entity(mock_hass, mock_config) -> SmartTRVClimate:
-    """Create a SmartTRVClimate entity."""
-    return SmartTRVClimate(mock_hass, "test_entry_id", mock_config)
+    """Create a SmartTRVClimate entity with state writes stubbed out."""
+    entity = SmartTRVClimate(mock_hass, "test_entry_id", mock_config)
+    entity.async_write_ha_state = MagicMock()
+    return entity
 
 
 class TestAsyncSetupEntry:
     """Tests for async_setup_entry function."""
 
-    @pytest.mark.asyncio
     async def test_setup_creates_entity(self, mock_hass, mock_config):
         """Test that setup creates a climate entity."""
         config_entry = MagicMock()
@@ -103,16 +149,16 @@ class TestSmartTRVClimateInit:
 
     def test_init_sets_basic_attributes(self, climate_entity, mock_config):
         """Test that initialization sets basic attributes."""
-        assert climate_entity._name == mock_config[CONF_NAME]
-        assert climate_entity._temperature_sensor == mock_config[CONF_TEMPERATURE_SENSOR]
-        assert climate_entity._trv_entities == mock_config[CONF_TRV_ENTITIES]
+        assert climate_entity._cfg.name == mock_config[CONF_NAME]
+        assert climate_entity._cfg.temperature_sensor == mock_config[CONF_TEMPERATURE_SENSOR]
+        assert climate_entity._trv_entities == tuple(mock_config[CONF_TRV_ENTITIES])
 
     def test_init_sets_temperature_config(self, climate_entity, mock_config):
         """Test that initialization sets temperature configuration."""
-        assert climate_entity._min_temp == mock_config[CONF_MIN_TEMP]
-        assert climate_entity._max_temp == mock_config[CONF_MAX_TEMP]
+        assert climate_entity._cfg.min_temp == mock_config[CONF_MIN_TEMP]
+        assert climate_entity._cfg.max_temp == mock_config[CONF_MAX_TEMP]
         assert climate_entity._target_temp == mock_config[CONF_TARGET_TEMP]
-        assert climate_entity._precision == mock_config[CONF_PRECISION]
+        assert climate_entity._cfg.precision == mock_config[CONF_PRECISION]
 
     def test_init_sets_control_config(self, climate_entity):
         """Test that initialization computes IMC gains (positive)."""
@@ -217,74 +263,49 @@ class TestSmartTRVClimateExtraStateAttributes:
         assert attrs[ATTR_ROOM_TEMPERATURE] == 19.5
         assert attrs[ATTR_TRV_ENTITIES] == mock_config[CONF_TRV_ENTITIES]
 
+    def test_extra_state_attributes_rounds_diagnostics(self, climate_entity):
+        """Test that diagnostics and IMC gains are reported rounded to two decimals."""
+        climate_entity._diag_error_c = 1.23456
+        climate_entity._diag_u_total = 0.98765
+
+        attrs = climate_entity.extra_state_attributes
+
+        assert attrs["controller_error_c"] == 1.23
+        assert attrs["controller_u_total"] == 0.99
+        assert attrs["imc_kc"] == round(climate_entity._proportional_gain, 2)
+        assert "controller_u_pi" not in attrs
+
 
 class TestSmartTRVClimateTemperatureUpdate:
     """Tests for temperature update functionality."""
 
-    @pytest.mark.asyncio
-    async def test_update_temperature_success(self, climate_entity, mock_hass):
+    def test_update_temperature_success(self, climate_entity, mock_hass):
         """Test successful temperature update."""
-        mock_state = MagicMock(spec=State)
-        mock_state.state = "21.5"
+        mock_state = _state("21.5")
         mock_hass.states.get.return_value = mock_state
         
-        await climate_entity._async_update_temperature()
+        climate_entity._async_update_temperature()
         
         assert climate_entity._current_temperature == 21.5
 
-    @pytest.mark.asyncio
-    async def test_update_temperature_unavailable(self, climate_entity, mock_hass):
-        """Test temperature update when sensor unavailable."""
-        mock_state = MagicMock(spec=State)
-        mock_state.state = STATE_UNAVAILABLE
-        mock_hass.states.get.return_value = mock_state
-        
-        climate_entity._current_temperature = 20.0  # Set initial value
-        await climate_entity._async_update_temperature()
-        
-        # Temperature should remain unchanged
-        assert climate_entity._current_temperature == 20.0
-
-    @pytest.mark.asyncio
-    async def test_update_temperature_unknown(self, climate_entity, mock_hass):
-        """Test temperature update when sensor unknown."""
-        mock_state = MagicMock(spec=State)
-        mock_state.state = STATE_UNKNOWN
-        mock_hass.states.get.return_value = mock_state
-        
-        climate_entity._current_temperature = 20.0
-        await climate_entity._async_update_temperature()
-        
-        assert climate_entity._current_temperature == 20.0
+    @pytest.mark.parametrize(
+        "state",
+        [_state(STATE_UNAVAILABLE), _state(STATE_UNKNOWN), None, _state("invalid")],
+        ids=["unavailable", "unknown", "none_state", "invalid_value"],
+    )
+    def test_update_temperature_keeps_last_value(self, climate_entity, mock_hass, state):
+        """Test an unusable sensor state leaves the last temperature unchanged."""
+        mock_hass.states.get.return_value = state
 
-    @pytest.mark.asyncio
-    async def test_update_temperature_none_state(self, climate_entity, mock_hass):
-        """Test temperature update when state is None."""
-        mock_hass.states.get.return_value = None
-        
         climate_entity._current_temperature = 20.0
-        await climate_entity._async_update_temperature()
-        
-        assert climate_entity._current_temperature == 20.0
+        climate_entity._async_update_temperature()
 
-    @pytest.mark.asyncio
-    async def test_update_temperature_invalid_value(self, climate_entity, mock_hass):
-        """Test temperature update with invalid value."""
-        mock_state = MagicMock(spec=State)
-        mock_state.state = "invalid"
-        mock_hass.states.get.return_value = mock_state
-        
-        climate_entity._current_temperature = 20.0
-        await climate_entity._async_update_temperature()
-        
-        # Temperature should remain unchanged due to parse error
         assert climate_entity._current_temperature == 20.0
 
 
 class TestSmartTRVClimateValvePositionCalculation:
     """Tests for valve position calculation."""
 
-    @pytest.mark.asyncio
     async def test_valve_position_when_mode_off(self, climate_entity, mock_hass):
         """Test valve position is 0 when mode is OFF."""
         climate_entity._hvac_mode = HVACMode.OFF
@@ -294,7 +315,6 @@ class TestSmartTRVClimateValvePositionCalculation:
         
         assert climate_entity._valve_position == VALVE_CLOSED_POSITION
 
-    @pytest.mark.asyncio
     async def test_valve_position_when_no_temperature(self, climate_entity, mock_hass):
         """Test valve position unchanged when no temperature available."""
         climate_entity._hvac_mode = HVACMode.AUTO
@@ -306,7 +326,6 @@ class TestSmartTRVClimateValvePositionCalculation:
         # Valve position should remain unchanged
         assert climate_entity._valve_position == 50
 
-    @pytest.mark.asyncio
     async def test_valve_position_proportional_control_heating_needed(self, climate_entity, mock_hass):
         """Test valve position calculation when heating is needed."""
         climate_entity._hvac_mode = HVACMode.AUTO
@@ -315,21 +334,21 @@ class TestSmartTRVClimateValvePositionCalculation:
         climate_entity._proportional_gain = 10.0
         
         # Mock TRV states
-        mock_trv_state = MagicMock(spec=State)
-        mock_trv_state.state = HVACMode.HEAT
+        mock_trv_state = _state(HVACMode.HEAT)
         mock_hass.states.get.return_value = mock_trv_state
         
         await climate_entity._async_control_heating()
 
         # IMC-only PI controller: with i_accum=0 on first call, output is
         # u = clamp(kp * norm_error, 0..1), so expected valve is:
-        span = max(0.1, climate_entity._max_temp - climate_entity._min_temp)
+        span = max(0.1, climate_entity._cfg.max_temp - climate_entity._cfg.min_temp)
         norm = min(climate_entity._target_temp - climate_entity._current_temperature, span) / span
         u = min(1.0, max(0.0, climate_entity._proportional_gain * norm))
         expected = int(round(u * VALVE_OPEN_POSITION))
+        # Commands are snapped to the minimum valve step before sending
+        expected = int(round(expected / VALVE_MIN_STEP)) * VALVE_MIN_STEP
         assert climate_entity._valve_position == expected
 
-    @pytest.mark.asyncio
     async def test_valve_position_proportional_control_no_heating_needed(self, climate_entity, mock_hass):
         """Test valve position calculation when no heating is needed."""
         climate_entity._hvac_mode = HVACMode.AUTO
@@ -337,8 +356,7 @@ class TestSmartTRVClimateValvePositionCalculation:
         climate_entity._current_temperature = 22.0
         climate_entity._proportional_gain = 10.0
         
-        mock_trv_state = MagicMock(spec=State)
-        mock_trv_state.state = HVACMode.HEAT
+        mock_trv_state = _state(HVACMode.HEAT)
         mock_hass.states.get.return_value = mock_trv_state
         
         await climate_entity._async_control_heating()
@@ -346,16 +364,14 @@ class TestSmartTRVClimateValvePositionCalculation:
         # Error = 20 - 22 = -2, valve = -2 * 10 = -20, clamped to 0
         assert climate_entity._valve_position == VALVE_CLOSED_POSITION
 
-    @pytest.mark.asyncio
     async def test_valve_position_clamped_to_max(self, climate_entity, mock_hass):
         """Test valve position is clamped to maximum."""
         climate_entity._hvac_mode = HVACMode.AUTO
         # Set error to cover the full configured temperature range so it reaches 255
-        climate_entity._target_temp = climate_entity._max_temp
-        climate_entity._current_temperature = climate_entity._min_temp
+        climate_entity._target_temp = climate_entity._cfg.max_temp
+        climate_entity._current_temperature = climate_entity._cfg.min_temp
         
-        mock_trv_state = MagicMock(spec=State)
-        mock_trv_state.state = HVACMode.HEAT
+        mock_trv_state = _state(HVACMode.HEAT)
         mock_hass.states.get.return_value = mock_trv_state
         
         await climate_entity._async_control_heating()
@@ -367,104 +383,43 @@ class TestSmartTRVClimateValvePositionCalculation:
 class TestSmartTRVClimateSetValvePosition:
     """Tests for setting valve position on TRVs."""
 
-    @pytest.mark.asyncio
-    async def test_set_valve_position_via_number_entity(self, climate_entity, mock_hass):
-        """Test setting valve position via number entity."""
-        mock_trv_state = MagicMock(spec=State)
-        mock_trv_state.state = HVACMode.HEAT
-        
-        mock_valve_state = MagicMock(spec=State)
-        
-        def mock_get_state(entity_id):
-            if "valve_position" in entity_id:
-                return mock_valve_state
-            return mock_trv_state
-        
-        mock_hass.states.get.side_effect = mock_get_state
-        
-        await climate_entity._async_set_valve_position(50)
-        
-        # Should call number.set_value service
-        mock_hass.services.async_call.assert_called()
-        call_args = mock_hass.services.async_call.call_args_list
-        assert any(
-            call[0][0] == "number" and call[0][1] == "set_value"
-            for call in call_args
+    @pytest.mark.parametrize(
+        ("trv_mode", "has_number", "initial", "position", "domain", "service"),
+        [
+            (HVACMode.HEAT, True, VALVE_CLOSED_POSITION, 50, "number", "set_value"),
+            (HVACMode.HEAT, False, 50, VALVE_CLOSED_POSITION, "climate", "set_hvac_mode"),
+            (HVACMode.HEAT, False, VALVE_CLOSED_POSITION, 50, "climate", "set_temperature"),
+            (HVACMode.OFF, False, VALVE_CLOSED_POSITION, 50, "climate", "set_hvac_mode"),
+        ],
+        ids=["via_number_entity", "via_climate_off", "via_climate_temperature", "turns_on_trv_if_off"],
+    )
+    async def test_set_valve_position_calls_service(
+        self, climate_entity, mock_hass, trv_mode, has_number, initial, position, domain, service
+    ):
+        """Test each push path issues the expected service call."""
+        trv_state = _state(trv_mode)
+        valve_state = _state("0") if has_number else None
+        mock_hass.states.get.side_effect = (
+            lambda entity_id: valve_state if "valve_position" in entity_id else trv_state
         )
+        # Start from a different commanded position so the update is not skipped
+        climate_entity._valve_position = initial
 
-    @pytest.mark.asyncio
-    async def test_set_valve_position_via_climate_off(self, climate_entity, mock_hass):
-        """Test setting valve position to 0 turns off TRV."""
-        mock_trv_state = MagicMock(spec=State)
-        mock_trv_state.state = HVACMode.HEAT
-        
-        def mock_get_state(entity_id):
-            if "valve_position" in entity_id:
-                return None  # No number entity
-            return mock_trv_state
-        
-        mock_hass.states.get.side_effect = mock_get_state
-        
-        # Set initial valve position to non-zero so the update is not skipped
-        climate_entity._valve_position = 50
-        
-        await climate_entity._async_set_valve_position(0)
-        
-        # Should call climate.set_hvac_mode with OFF
-        mock_hass.services.async_call.assert_called()
-        call_args = mock_hass.services.async_call.call_args_list
-        assert any(
-            call[0][0] == "climate" and call[0][1] == "set_hvac_mode"
-            for call in call_args
-        )
+        await climate_entity._async_set_valve_position(position)
 
-    @pytest.mark.asyncio
-    async def test_set_valve_position_via_climate_temperature(self, climate_entity, mock_hass):
-        """Test setting valve position via climate temperature."""
-        mock_trv_state = MagicMock(spec=State)
-        mock_trv_state.state = HVACMode.HEAT
-        
-        def mock_get_state(entity_id):
-            if "valve_position" in entity_id:
-                return None  # No number entity
-            return mock_trv_state
-        
-        mock_hass.states.get.side_effect = mock_get_state
-        
-        await climate_entity._async_set_valve_position(50)
-        
-        # Should call climate.set_temperature
-        mock_hass.services.async_call.assert_called()
-        call_args = mock_hass.services.async_call.call_args_list
         assert any(
-            call[0][0] == "climate" and call[0][1] == "set_temperature"
-            for call in call_args
+            call[0][0] == domain and call[0][1] == service
+            for call in mock_hass.services.async_call.call_args_list
         )
 
-    @pytest.mark.asyncio
-    async def test_set_valve_position_turns_on_trv_if_off(self, climate_entity, mock_hass):
-        """Test that setting valve position turns on TRV if it's off."""
-        mock_trv_state = MagicMock(spec=State)
-        mock_trv_state.state = HVACMode.OFF
-        
-        def mock_get_state(entity_id):
-            if "valve_position" in entity_id:
-                return None
-            return mock_trv_state
-        
-        mock_hass.states.get.side_effect = mock_get_state
-        
-        await climate_entity._async_set_valve_position(50)
-        
-        # Should call climate.set_hvac_mode with HEAT first
-        call_args = mock_hass.services.async_call.call_args_list
-        hvac_mode_calls = [
-            call for call in call_args
-            if call[0][0] == "climate" and call[0][1] == "set_hvac_mode"
-        ]
-        assert len(hvac_mode_calls) > 0
+    def test_virtual_setpoint_lut_spans_temperature_range(self, climate_entity, mock_config):
+        """Test that the fallback setpoint table maps closed/open to min/max temperature."""
+        lut = climate_entity._virtual_setpoint_lut
+        assert len(lut) == 256
+        assert lut[0] == pytest.approx(mock_config[CONF_MIN_TEMP])
+        assert lut[255] == pytest.approx(mock_config[CONF_MAX_TEMP])
+        assert lut[50] == pytest.approx(mock_config[CONF_MIN_TEMP] + 50 / 255.0 * (mock_config[CONF_MAX_TEMP] - mock_config[CONF_MIN_TEMP]))
 
-    @pytest.mark.asyncio
     async def test_set_valve_position_trv_not_found(self, climate_entity, mock_hass):
         """Test handling when TRV entity not found."""
         mock_hass.states.get.return_value = None
@@ -479,22 +434,15 @@ class TestSmartTRVClimateSetValvePosition:
 class TestSmartTRVClimateSetTemperature:
     """Tests for async_set_temperature method."""
 
-    @pytest.mark.asyncio
     async def test_set_temperature_updates_target(self, climate_entity, mock_hass):
         """Test that set_temperature updates target temperature."""
-        mock_state = MagicMock(spec=State)
-        mock_state.state = "20.0"
-        mock_hass.states.get.return_value = mock_state
-        
         climate_entity._current_temperature = 20.0
-        climate_entity.async_write_ha_state = MagicMock()
         
         await climate_entity.async_set_temperature(temperature=22.0)
         
         assert climate_entity._target_temp == 22.0
         climate_entity.async_write_ha_state.assert_called_once()
 
-    @pytest.mark.asyncio
     async def test_set_temperature_no_temperature_provided(self, climate_entity, mock_hass):
         """Test set_temperature does nothing when no temperature provided."""
         original_target = climate_entity._target_temp
@@ -503,15 +451,12 @@ class TestSmartTRVClimateSetTemperature:
         
         assert climate_entity._target_temp == original_target
 
-    @pytest.mark.asyncio
     async def test_set_temperature_triggers_control(self, climate_entity, mock_hass):
         """Test that set_temperature triggers heating control."""
-        mock_state = MagicMock(spec=State)
-        mock_state.state = HVACMode.HEAT
+        mock_state = _state(HVACMode.HEAT)
         mock_hass.states.get.return_value = mock_state
         
         climate_entity._current_temperature = 20.0
-        climate_entity.async_write_ha_state = MagicMock()
         
         await climate_entity.async_set_temperature(temperature=25.0)
         
@@ -522,118 +467,76 @@ class TestSmartTRVClimateSetTemperature:
 class TestSmartTRVClimateSetHvacMode:
     """Tests for async_set_hvac_mode method."""
 
-    @pytest.mark.asyncio
-    async def test_set_hvac_mode_heat(self, climate_entity, mock_hass):
-        """Test setting HVAC mode to HEAT."""
-        mock_state = MagicMock(spec=State)
-        mock_state.state = HVACMode.HEAT
-        mock_hass.states.get.return_value = mock_state
-        
-        climate_entity._hvac_mode = HVACMode.OFF
-        climate_entity.async_write_ha_state = MagicMock()
-        
-        await climate_entity.async_set_hvac_mode(HVACMode.HEAT)
-        
-        assert climate_entity._hvac_mode == HVACMode.HEAT
-        climate_entity.async_write_ha_state.assert_called_once()
+    @pytest.fixture(autouse=True)
+    def _heating_trvs(self, climate_entity, mock_hass):
+        """Report the TRVs as heating."""
+        mock_hass.states.get.return_value = _state(HVACMode.HEAT)
 
-    @pytest.mark.asyncio
-    async def test_set_hvac_mode_off(self, climate_entity, mock_hass):
-        """Test setting HVAC mode to OFF."""
-        mock_state = MagicMock(spec=State)
-        mock_state.state = HVACMode.HEAT
-        mock_hass.states.get.return_value = mock_state
-        
-        climate_entity._hvac_mode = HVACMode.HEAT
-        climate_entity.async_write_ha_state = MagicMock()
-        
-        await climate_entity.async_set_hvac_mode(HVACMode.OFF)
-        
-        assert climate_entity._hvac_mode == HVACMode.OFF
+    @pytest.mark.parametrize(
+        ("initial", "target"),
+        [(HVACMode.OFF, HVACMode.HEAT), (HVACMode.HEAT, HVACMode.OFF)],
+        ids=["heat", "off"],
+    )
+    async def test_set_hvac_mode(self, climate_entity, initial, target):
+        """Test switching between supported HVAC modes writes state once."""
+        climate_entity._hvac_mode = initial
+
+        await climate_entity.async_set_hvac_mode(target)
+
+        assert climate_entity._hvac_mode == target
         climate_entity.async_write_ha_state.assert_called_once()
 
-    @pytest.mark.asyncio
-    async def test_set_hvac_mode_unsupported(self, climate_entity, mock_hass):
+    async def test_set_hvac_mode_unsupported(self, climate_entity):
         """Test setting unsupported HVAC mode."""
         original_mode = climate_entity._hvac_mode
-        climate_entity.async_write_ha_state = MagicMock()
-        
+
         await climate_entity.async_set_hvac_mode(HVACMode.COOL)
-        
+
         # Mode should remain unchanged
         assert climate_entity._hvac_mode == original_mode
 
-    @pytest.mark.asyncio
-    async def test_set_hvac_mode_off_closes_valves(self, climate_entity, mock_hass):
+    async def test_set_hvac_mode_off_closes_valves(self, climate_entity):
         """Test that setting mode to OFF closes all valves."""
-        mock_state = MagicMock(spec=State)
-        mock_state.state = HVACMode.HEAT
-        mock_hass.states.get.return_value = mock_state
-        
         climate_entity._valve_position = 50
-        climate_entity.async_write_ha_state = MagicMock()
-        
+
         await climate_entity.async_set_hvac_mode(HVACMode.OFF)
-        
+
         assert climate_entity._valve_position == VALVE_CLOSED_POSITION
 
 
+async def _add_with_last_state(entity: SmartTRVClimate, last_state: Any) -> None:
+    """Run async_added_to_hass with the given restore state and no real listeners."""
+    with patch.object(entity, "async_get_last_state", new_callable=AsyncMock, return_value=last_state), \
+         patch.object(entity, "async_on_remove"), \
+         patch("custom_components.smart_trv.climate.async_track_state_change_event"):
+        await entity.async_added_to_hass()
+
+
 class TestSmartTRVClimateStateRestoration:
     """Tests for state restoration functionality."""
 
-    @pytest.mark.asyncio
     async def test_restore_hvac_mode(self, climate_entity, mock_hass):
         """Test restoring HVAC mode from last state."""
-        mock_last_state = MagicMock()
-        mock_last_state.state = HVACMode.OFF
-        mock_last_state.attributes = {}
+        mock_last_state = _state(HVACMode.OFF, {})
         
-        mock_temp_state = MagicMock(spec=State)
-        mock_temp_state.state = "20.0"
-        mock_hass.states.get.return_value = mock_temp_state
-        
-        with patch.object(climate_entity, "async_get_last_state", new_callable=AsyncMock) as mock_get_last, \
-             patch.object(climate_entity, "async_on_remove") as mock_on_remove, \
-             patch("custom_components.smart_trv.climate.async_track_state_change_event") as mock_track:
-            mock_get_last.return_value = mock_last_state
-            await climate_entity.async_added_to_hass()
+        await _add_with_last_state(climate_entity, mock_last_state)
         
         assert climate_entity._hvac_mode == HVACMode.OFF
 
-    @pytest.mark.asyncio
     async def test_restore_target_temperature(self, climate_entity, mock_hass):
         """Test restoring target temperature from last state."""
-        mock_last_state = MagicMock()
-        mock_last_state.state = HVACMode.HEAT
-        mock_last_state.attributes = {ATTR_TEMPERATURE: 23.5}
-        
-        mock_temp_state = MagicMock(spec=State)
-        mock_temp_state.state = "20.0"
-        mock_hass.states.get.return_value = mock_temp_state
+        mock_last_state = _state(HVACMode.HEAT, {ATTR_TEMPERATURE: 23.5})
         
-        with patch.object(climate_entity, "async_get_last_state", new_callable=AsyncMock) as mock_get_last, \
-             patch.object(climate_entity, "async_on_remove") as mock_on_remove, \
-             patch("custom_components.smart_trv.climate.async_track_state_change_event") as mock_track:
-            mock_get_last.return_value = mock_last_state
-            await climate_entity.async_added_to_hass()
+        await _add_with_last_state(climate_entity, mock_last_state)
         
         assert climate_entity._target_temp == 23.5
 
-    @pytest.mark.asyncio
     async def test_no_restore_when_no_last_state(self, climate_entity, mock_hass):
         """Test behavior when no last state available."""
-        mock_temp_state = MagicMock(spec=State)
-        mock_temp_state.state = "20.0"
-        mock_hass.states.get.return_value = mock_temp_state
-        
         original_hvac_mode = climate_entity._hvac_mode
         original_target_temp = climate_entity._target_temp
         
-        with patch.object(climate_entity, "async_get_last_state", new_callable=AsyncMock) as mock_get_last, \
-             patch.object(climate_entity, "async_on_remove") as mock_on_remove, \
-             patch("custom_components.smart_trv.climate.async_track_state_change_event") as mock_track:
-            mock_get_last.return_value = None
-            await climate_entity.async_added_to_hass()
+        await _add_with_last_state(climate_entity, None)
         
         assert climate_entity._hvac_mode == original_hvac_mode
         assert climate_entity._target_temp == original_target_temp
@@ -642,16 +545,137 @@ class TestSmartTRVClimateStateRestoration:
 class TestSmartTRVClimateTemperatureChanged:
     """Tests for temperature change callback."""
 
+    @pytest.fixture(autouse=True)
+    def _record_tasks(self, mock_hass):
+        """Record task scheduling; these tests assert on what gets queued."""
+        mock_hass.async_create_task = MagicMock(side_effect=lambda coro: coro)
+
     def test_temperature_changed_creates_tasks(self, climate_entity, mock_hass):
-        """Test that temperature change callback creates update tasks."""
-        mock_event = MagicMock()
-        climate_entity.async_write_ha_state = MagicMock()
-        
-        climate_entity._async_temperature_changed(mock_event)
-        
-        # Should create tasks for update and control
-        assert mock_hass.async_create_task.call_count == 2
+        """Test that temperature change callback caches inline and queues a single control task."""
+        mock_state = _state("19.5")
+        mock_hass.states.get.return_value = mock_state
+
+        climate_entity._async_temperature_changed(_EVENT)
+
+        # Sensor value is cached and published immediately; only control runs as a task
+        assert climate_entity._current_temperature == 19.5
+        climate_entity.async_write_ha_state.assert_called_once()
+        assert mock_hass.async_create_task.call_count == 1
+        mock_hass.async_create_task.call_args[0][0].close()
+
+    def test_sensor_event_burst_coalesces_control(self, climate_entity, mock_hass):
+        """Test that a burst of sensor events queues only one control run."""
+
+        climate_entity._async_temperature_changed(_EVENT)
+        climate_entity._async_temperature_changed(_EVENT)
+        climate_entity._async_ff_sensor_changed(_EVENT)
+
+        assert mock_hass.async_create_task.call_count == 1
+        mock_hass.async_create_task.call_args[0][0].close()
+
+    async def test_control_run_clears_pending_flag(self, climate_entity, mock_hass):
+        """Test that the queued run controls, writes state and allows a new run."""
+
+        climate_entity._async_temperature_changed(_EVENT)
+        await mock_hass.async_create_task.call_args[0][0]
+
+        assert climate_entity._current_temperature == 20.0
+        assert climate_entity._control_pending is False
+        # Once for the inline sensor update, once after the control pass
+        assert climate_entity.async_write_ha_state.call_count == 2
+
+    def test_ff_sensor_changed_single_task_no_early_write(self, climate_entity, mock_hass):
+        """Test that an FF sensor change queues one control task and defers the state write to it."""
+        climate_entity._cfg = replace(climate_entity._cfg, outdoor_sensor="sensor.outdoor")
+        mock_hass.states.get.return_value = State("sensor.outdoor", "4.0")
+
+        climate_entity._async_ff_sensor_changed(_EVENT)
+
+        assert mock_hass.async_create_task.call_count == 1
+        climate_entity.async_write_ha_state.assert_not_called()
+        mock_hass.async_create_task.call_args[0][0].close()
+
+    def test_control_runs_throttled_to_trailing_edge(self, climate_entity, mock_hass):
+        """Test that a sensor change right after a control run is deferred, not dropped."""
+        import time
+
+        mock_hass.states.get.return_value = State("sensor.room_temperature", "19.0")
+        climate_entity._last_control_monotonic = time.monotonic()
+
+        with patch("custom_components.smart_trv.climate.async_call_later") as mock_call_later:
+            climate_entity._async_temperature_changed(_EVENT)
+            climate_entity._async_temperature_changed(_EVENT)
+
+        mock_hass.async_create_task.assert_not_called()
+        mock_call_later.assert_called_once()
+        delay = mock_call_later.call_args[0][1]
+        assert 0 < delay <= 2.0
+        assert climate_entity._control_pending is True
+
+    def test_trv_state_changed_updates_inline(self, climate_entity, mock_hass):
+        """Test that TRV state changes refresh the actual valve position without a task."""
+        climate_entity._async_update_actual_valve_position = MagicMock()
+
+        climate_entity._async_trv_state_changed(_EVENT)
+
+        climate_entity._async_update_actual_valve_position.assert_called_once()
         climate_entity.async_write_ha_state.assert_called_once()
+        mock_hass.async_create_task.assert_not_called()
+
+    def test_ff_sensor_unavailable_clears_cache(self, climate_entity, mock_hass):
+        """Test that unavailable or non-numeric FF sensors reset the cached value."""
+        climate_entity._cfg = replace(climate_entity._cfg, outdoor_sensor="sensor.outdoor", boiler_flow_sensor="sensor.flow")
+        states = {
+            "sensor.outdoor": State("sensor.outdoor", STATE_UNAVAILABLE),
+            "sensor.flow": State("sensor.flow", "not_a_number"),
+        }
+        mock_hass.states.get.side_effect = states.get
+        climate_entity._outdoor_temp = 5.0
+        climate_entity._boiler_flow_temp = 50.0
+
+        climate_entity._async_update_ff_sensors()
+
+        assert climate_entity._outdoor_temp is None
+        assert climate_entity._boiler_flow_temp is None
+
+        states["sensor.outdoor"] = State("sensor.outdoor", "3.5")
+        climate_entity._async_update_ff_sensors()
+        assert climate_entity._outdoor_temp == 3.5
+
+    def test_repeated_temperature_skips_control(self, climate_entity, mock_hass):
+        """Test that re-emitted identical readings neither write state nor queue control."""
+        mock_hass.states.get.return_value = State("sensor.room_temperature", "20.0")
+        climate_entity._current_temperature = 20.0
+
+        climate_entity._async_temperature_changed(_EVENT)
+
+        climate_entity.async_write_ha_state.assert_not_called()
+        mock_hass.async_create_task.assert_not_called()
+
+    def test_repeated_temperature_flushes_pending_valve_command(self, climate_entity, mock_hass):
+        """Test that a repeat still runs control while a throttled valve command is pending."""
+        mock_hass.states.get.return_value = State("sensor.room_temperature", "20.0")
+        climate_entity._current_temperature = 20.0
+        climate_entity._desired_valve_position = 120
+        climate_entity._valve_position = 100
+
+        climate_entity._async_temperature_changed(_EVENT)
+
+        assert mock_hass.async_create_task.call_count == 1
+        mock_hass.async_create_task.call_args[0][0].close()
+
+    async def test_repeated_temperature_skips_control_after_snapped_send(self, climate_entity, mock_hass):
+        """Test that a sent command off the snap grid does not stay pending."""
+        climate_entity._hvac_mode = HVACMode.AUTO
+        await climate_entity._async_request_valve_position(222, force=True)
+        assert climate_entity._desired_valve_position == 222
+        assert climate_entity._valve_position == 220
+
+        mock_hass.states.get.return_value = State("sensor.room_temperature", "20.0")
+        climate_entity._current_temperature = 20.0
+        climate_entity._async_temperature_changed(_EVENT)
+
+        mock_hass.async_create_task.assert_not_called()
 
 
 class TestSmartTRVClimateEdgeCases:
@@ -680,6 +704,13 @@ class TestSmartTRVClimateEdgeCases:
         assert entity.target_temperature == 18.0
         assert entity.target_temperature_step == 1.0
 
+    def test_integer_precision_parsed_as_float(self, mock_hass):
+        """Test that an integer precision from the config entry is stored as a float."""
+        entity = SmartTRVClimate(mock_hass, "int_precision", dict(_MOCK_CONFIG, **{CONF_PRECISION: 1}))
+
+        assert entity.target_temperature_step == 1.0
+        assert type(entity.target_temperature_step) is float
+
     def test_empty_trv_list(self, mock_hass):
         """Test climate entity with empty TRV list."""
         config = {
@@ -694,24 +725,41 @@ class TestSmartTRVClimateEdgeCases:
         
         entity = SmartTRVClimate(mock_hass, "empty_entry", config)
         
-        assert entity._trv_entities == []
+        assert entity._trv_entities == ()
+
+    def test_inverted_temperature_range_is_swapped(self, mock_hass, mock_config):
+        """Test that min/max are swapped and the target is clamped into range."""
+        config = dict(mock_config, **{CONF_MIN_TEMP: 25.0, CONF_MAX_TEMP: 10.0, CONF_TARGET_TEMP: 30.0})
+
+        entity = SmartTRVClimate(mock_hass, "swap_entry", config)
+
+        assert (entity._cfg.min_temp, entity._cfg.max_temp) == (10.0, 25.0)
+        assert entity._target_temp == 25.0
 
-    @pytest.mark.asyncio
-    async def test_service_call_exception_handling(self, climate_entity, mock_hass):
+    def test_invalid_imc_parameters_raise(self, mock_hass, mock_config):
+        """Test that non-positive IMC parameters are rejected."""
+        config = dict(mock_config, imc_process_gain=0.0)
+
+        with pytest.raises(ValueError):
+            SmartTRVClimate(mock_hass, "bad_imc_entry", config)
+
+    async def test_service_call_exception_handling(self, climate_entity, mock_hass, caplog):
         """Test that service call exceptions are handled gracefully."""
-        mock_trv_state = MagicMock(spec=State)
-        mock_trv_state.state = HVACMode.HEAT
-        
-        def mock_get_state(entity_id):
-            if "valve_position" in entity_id:
-                return None
-            return mock_trv_state
-        
-        mock_hass.states.get.side_effect = mock_get_state
+        # One TRV is enough to exercise the error path
+        climate_entity._set_trv_entities(["climate.trv"])
+        caplog.set_level(logging.ERROR, logger="custom_components.smart_trv.climate")
+        trv_state = _state(HVACMode.HEAT)
+        mock_hass.states.get.side_effect = (
+            lambda entity_id: None if "valve_position" in entity_id else trv_state
+        )
         mock_hass.services.async_call.side_effect = Exception("Service error")
-        
+
         # Should not raise exception
         await climate_entity._async_set_valve_position(50)
-        
+
         # Valve position should still be updated internally
         assert climate_entity._valve_position == 50
+        # The failure is reported rather than swallowed
+        errors = [r for r in caplog.records if r.levelno == logging.ERROR]
+        assert len(errors) == 1
+        assert "Failed to set valve position on climate.trv" in errors[0].getMessage()
@@ -58,6 +58,21 @@ class TestGetConfigSchema:
         schema = get_config_schema(custom_defaults)
         assert schema is not None
 
+    def test_schema_is_cached_per_defaults(self):
+        """Test that equal defaults reuse the schema and different defaults do not."""
+        defaults = {CONF_NAME: "Cached TRV", CONF_TRV_ENTITIES: ["climate.a", "climate.b"]}
+        schema = get_config_schema(defaults)
+        assert get_config_schema(dict(defaults)) is schema
+        assert get_config_schema({**defaults, CONF_TARGET_TEMP: 19.0}) is not schema
+        # The TRV list default is still handed to the form as a list
+        trv_key = next(key for key in schema.schema if str(key) == CONF_TRV_ENTITIES)
+        assert trv_key.default() == ["climate.a", "climate.b"]
+
+    def test_unhashable_defaults_bypass_cache(self):
+        """Test that unhashable default values still produce a schema."""
+        schema = get_config_schema({CONF_NAME: "TRV", CONF_TARGET_TEMP: {"bad": 1}})
+        assert isinstance(schema, vol.Schema)
+
     def test_schema_has_required_fields(self):
         """Test that schema has all required fields."""
         schema = get_config_schema()
@@ -93,12 +108,10 @@ class TestSmartTRVConfigFlow:
         flow.hass = MagicMock(spec=HomeAssistant)
         return flow
 
-    @pytest.mark.asyncio
-    async def test_flow_init(self, flow):
+    def test_flow_init(self, flow):
         """Test flow initialization."""
         assert flow.VERSION == 1
 
-    @pytest.mark.asyncio
     async def test_step_user_shows_form_when_no_input(self, flow):
         """Test that user step shows form when no input provided."""
         result = await flow.async_step_user(user_input=None)
@@ -107,7 +120,6 @@ class TestSmartTRVConfigFlow:
         assert result["step_id"] == "user"
         assert "data_schema" in result
 
-    @pytest.mark.asyncio
     async def test_step_user_error_no_temperature_sensor(self, flow):
         """Test error when no temperature sensor provided."""
         user_input = {
@@ -121,7 +133,6 @@ class TestSmartTRVConfigFlow:
         assert result["type"] == FlowResultType.FORM
         assert result["errors"][CONF_TEMPERATURE_SENSOR] == "no_temperature_sensor"
 
-    @pytest.mark.asyncio
     async def test_step_user_error_no_trv_entities(self, flow):
         """Test error when no TRV entities provided."""
         user_input = {
@@ -135,7 +146,6 @@ class TestSmartTRVConfigFlow:
         assert result["type"] == FlowResultType.FORM
         assert result["errors"][CONF_TRV_ENTITIES] == "no_trv_entities"
 
-    @pytest.mark.asyncio
     async def test_step_user_creates_entry_with_valid_input(self, flow):
         """Test entry creation with valid input."""
         user_input = {
@@ -160,7 +170,6 @@ class TestSmartTRVConfigFlow:
         assert result["title"] == "Test TRV"
         assert result["data"] == user_input
 
-    @pytest.mark.asyncio
     async def test_step_user_sets_unique_id(self, flow):
         """Test that unique ID is set based on temperature sensor."""
         user_input = {
@@ -195,6 +204,46 @@ class TestSmartTRVOptionsFlowClass:
         assert callable(getattr(SmartTRVOptionsFlow, "async_step_init"))
 
 
+class TestSmartTRVOptionsFlow:
+    """Tests for the options flow step."""
+
+    _ENTRY_DATA = {
+        CONF_NAME: "Living Room",
+        CONF_TEMPERATURE_SENSOR: "sensor.room",
+        CONF_TRV_ENTITIES: ["climate.trv"],
+        CONF_TARGET_TEMP: DEFAULT_TARGET_TEMP,
+    }
+
+    @pytest.fixture
+    def options_flow(self) -> SmartTRVOptionsFlow:
+        """Create an options flow for a mock entry; the frame helper needs a running hass, so skip its usage report."""
+        entry = MagicMock(spec=config_entries.ConfigEntry)
+        entry.data = dict(self._ENTRY_DATA)
+        entry.options = {}
+        with patch("homeassistant.config_entries.report_usage"):
+            flow = SmartTRVOptionsFlow(entry)
+        flow.hass = MagicMock(spec=HomeAssistant)
+        flow.hass.config_entries = MagicMock()
+        return flow
+
+    async def test_unchanged_save_skips_entry_update(self, options_flow):
+        """Test that saving identical options does not update (and so reload) the entry."""
+        result = await options_flow.async_step_init(user_input=dict(self._ENTRY_DATA))
+
+        assert result["type"] == FlowResultType.CREATE_ENTRY
+        options_flow.hass.config_entries.async_update_entry.assert_not_called()
+
+    async def test_changed_save_updates_entry_once(self, options_flow):
+        """Test that a changed option is merged into the entry data with one update."""
+        result = await options_flow.async_step_init(user_input={CONF_TARGET_TEMP: DEFAULT_TARGET_TEMP + 1.0})
+
+        assert result["type"] == FlowResultType.CREATE_ENTRY
+        options_flow.hass.config_entries.async_update_entry.assert_called_once_with(
+            options_flow.config_entry,
+            data={**self._ENTRY_DATA, CONF_TARGET_TEMP: DEFAULT_TARGET_TEMP + 1.0},
+        )
+
+
 class TestConfigFlowDomain:
     """Test config flow domain registration."""
 
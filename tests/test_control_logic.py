@@ -1,10 +1,15 @@
 from __future__ import annotations
 
+import asyncio
+import itertools
+import time
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
 from homeassistant.components.climate import HVACMode
+from homeassistant.core import State
 
 from custom_components.smart_trv.climate import SmartTRVClimate
 from custom_components.smart_trv.const import (
@@ -14,16 +19,14 @@ from custom_components.smart_trv.const import (
 
 @pytest.fixture
 def hass_mock():
-    from homeassistant.core import HomeAssistant
-
-    hass = MagicMock(spec=HomeAssistant)
-    # Some HA helpers expect hass.data and an integrations cache to exist
-    hass.data = {"integrations": {}}
-    hass.states = MagicMock()
-    hass.services = MagicMock()
-    hass.services.async_call = AsyncMock()
-    hass.async_create_task = MagicMock(side_effect=lambda coro: coro)
-    return hass
+    # Only the attributes the controller touches; a plain namespace avoids speccing HomeAssistant
+    return SimpleNamespace(
+        # Some HA helpers expect hass.data and an integrations cache to exist
+        data={"integrations": {}},
+        states=MagicMock(),
+        services=SimpleNamespace(async_call=AsyncMock()),
+        async_create_task=lambda coro: coro,
+    )
 
 
 @pytest.fixture
@@ -39,14 +42,20 @@ def cfg_defaults():
     }
 
 
+@pytest.fixture
+def zero_ff():
+    """Take feed-forward out of the loop so tests see the PI/decay path alone."""
+    with patch.object(SmartTRVClimate, "_update_feedforward", return_value=0.0):
+        yield
+
+
 def _set_temp(entity: SmartTRVClimate, current: float, target: float | None = None) -> None:
     entity._current_temperature = current
     if target is not None:
         entity._target_temp = target
 
 
-@pytest.mark.asyncio
-async def test_in_band_decays_toward_zero(hass_mock, cfg_defaults):
+async def test_in_band_decays_toward_zero(hass_mock, cfg_defaults, zero_ff):
     ent = SmartTRVClimate(hass_mock, "e1", cfg_defaults)
     # equal to setpoint -> error 0 (in band)
     _set_temp(ent, current=21.0, target=21.0)
@@ -56,20 +65,16 @@ async def test_in_band_decays_toward_zero(hass_mock, cfg_defaults):
     ent._valve_position = ent._desired_valve_position
 
     # Ensure dt > 0 by setting last update to the past
-    import time as _t
+    ent._last_update_monotonic = time.monotonic() - 600.0  # 10 minutes
 
-    ent._last_update_monotonic = _t.monotonic() - 600.0  # 10 minutes
-
-    # Patch FF to zero; in-band should decay toward 0
-    with patch.object(ent, "_update_feedforward", return_value=(0.0, 0.0)):
-        await ent._async_control_heating()
+    # FF is zeroed by the fixture; in-band should decay toward 0
+    await ent._async_control_heating()
 
     new_u = ent._desired_valve_position / VALVE_OPEN_POSITION
     assert 0.0 <= new_u < 0.2
 
 
-@pytest.mark.asyncio
-async def test_in_band_negative_error_decays_toward_zero(hass_mock, cfg_defaults):
+async def test_in_band_negative_error_decays_toward_zero(hass_mock, cfg_defaults, zero_ff):
     ent = SmartTRVClimate(hass_mock, "e2", cfg_defaults)
     # Slightly above target (negative error, still in band)
     ent._steady_deadband_c = 0.2
@@ -79,12 +84,9 @@ async def test_in_band_negative_error_decays_toward_zero(hass_mock, cfg_defaults
     ent._valve_position = ent._desired_valve_position
 
     # Ensure dt > 0 by setting last update to the past
-    import time as _t
-
-    ent._last_update_monotonic = _t.monotonic() - 600.0  # 10 minutes
+    ent._last_update_monotonic = time.monotonic() - 600.0  # 10 minutes
 
-    with patch.object(ent, "_update_feedforward", return_value=(0.0, 0.0)):
-        await ent._async_control_heating()
+    await ent._async_control_heating()
 
     prev_u = 0.2
     # New u should be strictly less than previous and >= 0
@@ -92,7 +94,6 @@ async def test_in_band_negative_error_decays_toward_zero(hass_mock, cfg_defaults
     assert 0.0 <= new_u < prev_u
 
 
-@pytest.mark.asyncio
 async def test_cool_side_positive_u_decays_toward_zero(hass_mock, cfg_defaults):
     ent = SmartTRVClimate(hass_mock, "e3", cfg_defaults)
     # Make error clearly on cool side (above target by > eps)
@@ -104,12 +105,10 @@ async def test_cool_side_positive_u_decays_toward_zero(hass_mock, cfg_defaults):
     ent._valve_position = ent._desired_valve_position
 
     # Ensure dt > 0 by setting last update to the past
-    import time as _t
-
-    ent._last_update_monotonic = _t.monotonic() - 600.0  # 10 minutes
+    ent._last_update_monotonic = time.monotonic() - 600.0  # 10 minutes
 
     # Force FF to a small positive value; cool side should ignore FF floor and decay to 0
-    with patch.object(ent, "_update_feedforward", return_value=(0.1, 0.1)):
+    with patch.object(ent, "_update_feedforward", return_value=0.1):
         await ent._async_control_heating()
 
     new_u = ent._desired_valve_position / VALVE_OPEN_POSITION
@@ -117,71 +116,57 @@ async def test_cool_side_positive_u_decays_toward_zero(hass_mock, cfg_defaults):
     assert 0.0 <= new_u < 0.2
 
 
-@pytest.mark.asyncio
 async def test_heat_side_uses_pi_plus_ff(hass_mock, cfg_defaults):
     ent = SmartTRVClimate(hass_mock, "e4", cfg_defaults)
     _set_temp(ent, current=20.0, target=21.0)  # error = +1.0 -> heat_side
 
     # Stub PI and FF to predictable values
-    with patch.object(ent, "_compute_pi", return_value=(0.4, 0.0)):
-        with patch.object(ent, "_update_feedforward", return_value=(0.1, 0.1)):
+    with patch.object(ent, "_compute_pi", return_value=0.4):
+        with patch.object(ent, "_update_feedforward", return_value=0.1):
             await ent._async_control_heating()
 
     u = ent._desired_valve_position / VALVE_OPEN_POSITION
     assert pytest.approx(u, rel=0.01) == 0.5
 
 
-@pytest.mark.asyncio
-async def test_integral_separation_no_growth_in_band(hass_mock, cfg_defaults):
+async def test_integral_separation_no_growth_in_band(hass_mock, cfg_defaults, zero_ff):
     ent = SmartTRVClimate(hass_mock, "e5", cfg_defaults)
     _set_temp(ent, current=21.02, target=21.0)  # small negative error in band
     ent._i_accum = 5.0
     # Ensure dt positive
-    import time as _t
+    ent._last_update_monotonic = time.monotonic() - 120.0
 
-    ent._last_update_monotonic = _t.monotonic() - 120.0
-
-    with patch.object(ent, "_update_feedforward", return_value=(0.0, 0.0)):
-        await ent._async_control_heating()
+    await ent._async_control_heating()
 
     # In band, integral should be frozen (no increase)
     assert ent._i_accum <= 5.0
 
 
-@pytest.mark.asyncio
-async def test_integral_bleed_on_cool_side(hass_mock, cfg_defaults):
+async def test_integral_bleed_on_cool_side(hass_mock, cfg_defaults, zero_ff):
     ent = SmartTRVClimate(hass_mock, "e6", cfg_defaults)
     _set_temp(ent, current=21.5, target=21.0)  # cool_side
     ent._i_accum = 5.0
     # dt known
-    import time as _t
+    ent._last_update_monotonic = time.monotonic() - 100.0
 
-    ent._last_update_monotonic = _t.monotonic() - 100.0
-
-    with patch.object(ent, "_update_feedforward", return_value=(0.0, 0.0)):
-        await ent._async_control_heating()
+    await ent._async_control_heating()
 
     # Bleed rate per s should reduce accumulator
     assert ent._i_accum < 5.0
 
 
-@pytest.mark.asyncio
-async def test_integral_grows_on_heat_side(hass_mock, cfg_defaults):
+async def test_integral_grows_on_heat_side(hass_mock, cfg_defaults, zero_ff):
     ent = SmartTRVClimate(hass_mock, "e7", cfg_defaults)
     _set_temp(ent, current=20.0, target=21.0)  # heat_side
     ent._i_accum = 0.0
-    import time as _t
-
-    ent._last_update_monotonic = _t.monotonic() - 60.0
+    ent._last_update_monotonic = time.monotonic() - 60.0
 
     # Ensure tentative_u < 1 so integration occurs
-    with patch.object(ent, "_update_feedforward", return_value=(0.0, 0.0)):
-        await ent._async_control_heating()
+    await ent._async_control_heating()
 
     assert ent._i_accum > 0.0
 
 
-@pytest.mark.asyncio
 async def test_boost_mode_opens_valve_and_sets_timer(hass_mock, cfg_defaults):
     ent = SmartTRVClimate(hass_mock, "e8", cfg_defaults)
 
@@ -197,13 +182,30 @@ async def test_boost_mode_opens_valve_and_sets_timer(hass_mock, cfg_defaults):
         assert ent._boost_until is not None
 
 
-@pytest.mark.asyncio
+async def test_boost_expiry_left_to_timer_and_cancelled_on_remove(hass_mock, cfg_defaults):
+    ent = SmartTRVClimate(hass_mock, "e8b", cfg_defaults)
+    ent.async_write_ha_state = MagicMock()
+    unsub = MagicMock()
+
+    with patch("custom_components.smart_trv.climate.async_call_later", return_value=unsub):
+        await ent.async_set_hvac_mode(HVACMode.HEAT)
+
+    # Even past the deadline, control ticks do not end boost while the timer is armed
+    ent._boost_until = 0.0
+    await ent._async_control_heating()
+    assert ent._hvac_mode == HVACMode.HEAT
+
+    await ent.async_will_remove_from_hass()
+    unsub.assert_called_once()
+    assert ent._boost_until is None
+
+
 async def test_valve_update_throttling(hass_mock, cfg_defaults):
     ent = SmartTRVClimate(hass_mock, "e9", cfg_defaults)
 
     calls = []
 
-    async def _spy_set(pos: int):
+    async def _spy_set(pos: int, now: float | None = None):
         calls.append(pos)
         # Simulate the underlying immediate set updating internal state
         ent._valve_position = pos
@@ -213,19 +215,16 @@ async def test_valve_update_throttling(hass_mock, cfg_defaults):
         # First send should go through immediately
         await ent._async_request_valve_position(100)
         # Second send within min interval should be coalesced (no immediate call)
-        import time as _t
-
-        ent._last_valve_send_monotonic = _t.monotonic()  # just sent now
+        ent._last_valve_send_monotonic = time.monotonic()  # just sent now
         await ent._async_request_valve_position(120)
 
     assert calls == [100]
 
 
-@pytest.mark.asyncio
 async def test_set_valve_resends_when_actual_differs(hass_mock, cfg_defaults):
     """If requested equals last commanded but actual differs, do NOT skip update."""
     ent = SmartTRVClimate(hass_mock, "e10", cfg_defaults)
-    ent._trv_entities = ["climate.trv"]
+    ent._set_trv_entities(["climate.trv"])
     # Last commanded equals requested
     ent._valve_position = 100
     # Actual aggregated position differs
@@ -255,11 +254,10 @@ async def test_set_valve_resends_when_actual_differs(hass_mock, cfg_defaults):
     assert hass_mock.services.async_call.await_count >= 1
 
 
-@pytest.mark.asyncio
 async def test_set_valve_skips_when_actual_matches(hass_mock, cfg_defaults):
     """If requested equals last commanded and actual matches, skip update."""
     ent = SmartTRVClimate(hass_mock, "e11", cfg_defaults)
-    ent._trv_entities = ["climate.trv"]
+    ent._set_trv_entities(["climate.trv"])
     ent._valve_position = 120
     ent._actual_valve_position = 120
 
@@ -275,15 +273,14 @@ async def test_set_valve_skips_when_actual_matches(hass_mock, cfg_defaults):
     hass_mock.services.async_call.assert_not_awaited()
 
 
-@pytest.mark.asyncio
 async def test_multi_trv_selective_resend_only_mismatched(hass_mock, cfg_defaults):
     """With multiple TRVs: when requested equals last commanded, resend only to TRVs not at target."""
     ent = SmartTRVClimate(hass_mock, "e12", cfg_defaults)
-    ent._trv_entities = ["climate.trv_a", "climate.trv_b"]
+    ent._set_trv_entities(["climate.trv_a", "climate.trv_b"])
     # Last commanded equals requested
     ent._valve_position = 150
     # Actuals: A at 150 (match), B at 100 (mismatch)
-    ent._actual_valve_map = {"climate.trv_a": 150, "climate.trv_b": 100}
+    ent._actual_valve_positions = (150, 100)
     ent._actual_valve_position = 150
 
     # Provide number entities for both TRVs
@@ -308,21 +305,18 @@ async def test_multi_trv_selective_resend_only_mismatched(hass_mock, cfg_default
 
     await ent._async_set_valve_position(150)
 
-    # Should have issued a service call only for TRV B's number entity
-    calls = [args for args, _ in getattr(hass_mock.services.async_call, 'await_args_list', [])]
-    # Extract entity_ids from service data (3rd positional arg)
-    entity_ids = [args[2].get("entity_id") if len(args) >= 3 and isinstance(args[2], dict) else None for args in calls]
-    assert "number.trv_b_valve_position" in entity_ids
-    assert "number.trv_a_valve_position" not in entity_ids
+    # Should have issued one batched call covering only TRV B's number entity
+    hass_mock.services.async_call.assert_awaited_once_with(
+        "number", "set_value", {"entity_id": ["number.trv_b_valve_position"], "value": 150}, blocking=True
+    )
 
 
-@pytest.mark.asyncio
 async def test_multi_trv_all_match_skip(hass_mock, cfg_defaults):
     """With multiple TRVs: when all actuals equal requested and last commanded, skip updates."""
     ent = SmartTRVClimate(hass_mock, "e13", cfg_defaults)
-    ent._trv_entities = ["climate.trv_a", "climate.trv_b"]
+    ent._set_trv_entities(["climate.trv_a", "climate.trv_b"])
     ent._valve_position = 90
-    ent._actual_valve_map = {"climate.trv_a": 90, "climate.trv_b": 90}
+    ent._actual_valve_positions = (90, 90)
     ent._actual_valve_position = 90
 
     # States exist but should not be called
@@ -333,14 +327,13 @@ async def test_multi_trv_all_match_skip(hass_mock, cfg_defaults):
     hass_mock.services.async_call.assert_not_awaited()
 
 
-@pytest.mark.asyncio
 async def test_position_changed_sends_to_all_trvs(hass_mock, cfg_defaults):
     """When requested differs from last commanded, send to all TRVs regardless of actuals."""
     ent = SmartTRVClimate(hass_mock, "e14", cfg_defaults)
-    ent._trv_entities = ["climate.trv_a", "climate.trv_b"]
+    ent._set_trv_entities(["climate.trv_a", "climate.trv_b"])
     ent._valve_position = 80  # last commanded
     # Actuals arbitrary
-    ent._actual_valve_map = {"climate.trv_a": 80, "climate.trv_b": 120}
+    ent._actual_valve_positions = (80, 120)
 
     mock_trv_a = MagicMock(); mock_trv_a.state = HVACMode.HEAT
     mock_trv_b = MagicMock(); mock_trv_b.state = HVACMode.HEAT
@@ -363,6 +356,209 @@ async def test_position_changed_sends_to_all_trvs(hass_mock, cfg_defaults):
 
     await ent._async_set_valve_position(100)
 
-    # Expect two number.set_value calls
-    count_number_calls = sum(1 for (args, kwargs) in getattr(hass_mock.services.async_call, 'await_args_list', []) if args and args[0] == "number")
-    assert count_number_calls == 2
+    # Expect both number entities in a single batched number.set_value call
+    hass_mock.services.async_call.assert_awaited_once_with(
+        "number",
+        "set_value",
+        {"entity_id": ["number.trv_a_valve_position", "number.trv_b_valve_position"], "value": 100},
+        blocking=True,
+    )
+
+
+def test_feedforward_sums_deadbanded_signals(hass_mock, cfg_defaults):
+    cfg = dict(cfg_defaults, outdoor_temperature_sensor="sensor.outdoor", boiler_flow_temperature_sensor="sensor.flow",
+               ff_k_flow=0.01, ff_k_outdoor=0.02, ff_flow_deadband_k=1.0, ff_outdoor_deadband_k=0.0,
+               ff_tflow_ref=50.0, ff_tout_ref=5.0, ff_enable_smoothing=False)
+    ent = SmartTRVClimate(hass_mock, "e_ff", cfg)
+    ent._boiler_flow_temp = 45.0  # d = 5 -> 4 after deadband
+    ent._outdoor_temp = 0.0  # d = 5, no deadband
+
+    u_ff = ent._update_feedforward(100.0)
+
+    assert u_ff == pytest.approx(0.01 * 4.0 + 0.02 * 5.0)
+
+    # Missing signals contribute nothing
+    ent._flow_filt = None
+    ent._boiler_flow_temp = None
+    u_ff = ent._update_feedforward(160.0)
+    assert u_ff == pytest.approx(0.02 * 5.0)
+
+
+def test_feedforward_inactive_without_sensors(hass_mock, cfg_defaults):
+    ent = SmartTRVClimate(hass_mock, "e_noff", dict(cfg_defaults, ff_tflow_ref=50.0))
+    ent._boiler_flow_temp = 45.0
+
+    assert ent._update_feedforward(100.0) == 0.0
+    assert ent._diag_u_ff == 0.0
+    # Filters are not touched when no FF sensor is configured
+    assert ent._flow_filt is None
+    assert ent._last_ff_update_monotonic is None
+
+
+def test_snap_to_step_matches_round_and_clamps():
+    for v in range(-10, 270):
+        expected = max(0, min(VALVE_OPEN_POSITION, int(round(max(0, min(VALVE_OPEN_POSITION, v)) / 5)) * 5))
+        assert SmartTRVClimate._snap_to_step(v, 5, 0, VALVE_OPEN_POSITION) == expected
+    assert SmartTRVClimate._snap_to_step(300, 1, 0, VALVE_OPEN_POSITION) == VALVE_OPEN_POSITION
+
+
+async def test_valve_commands_dispatched_concurrently(hass_mock, cfg_defaults):
+    """The batched number call and per-TRV fallbacks are in flight together; one failure does not stop the rest."""
+    ent = SmartTRVClimate(hass_mock, "e_gather", cfg_defaults)
+    ent._set_trv_entities(["climate.trv_a", "climate.trv_b", "climate.trv_c"])
+    # A has a valve number entity; B and C fall back to climate control
+    hass_mock.states.get.side_effect = lambda eid: (
+        None if eid in ("number.trv_b_valve_position", "number.trv_c_valve_position") else MagicMock(state="heat")
+    )
+
+    in_flight = 0
+    peak = 0
+    completed = []
+
+    async def _slow_call(domain, service, data, blocking=False):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0)
+        in_flight -= 1
+        if data["entity_id"] == "climate.trv_b":
+            raise RuntimeError("boom")
+        completed.append(data["entity_id"])
+
+    hass_mock.services.async_call = AsyncMock(side_effect=_slow_call)
+
+    await ent._async_set_valve_position(100)
+
+    assert peak == 3
+    assert len(completed) == 2
+    assert "climate.trv_c" in completed
+    assert ["number.trv_a_valve_position"] in completed
+
+
+def test_actual_valve_readout_clamps_and_falls_back(hass_mock, cfg_defaults):
+    ent = SmartTRVClimate(hass_mock, "e_read", cfg_defaults)
+    ent._set_trv_entities(["climate.trv_a", "climate.trv_b", "climate.trv_c"])
+    states = {
+        "number.trv_a_valve_position": State("number.trv_a_valve_position", "300.4"),
+        "climate.trv_b": State("climate.trv_b", "heat", {"valve_position": 99.6}),
+        "climate.trv_c": State("climate.trv_c", "heat", {}),
+    }
+    hass_mock.states.get.side_effect = states.get
+
+    ent._async_update_actual_valve_position()
+
+    assert ent._actual_valve_positions == (VALVE_OPEN_POSITION, 100, None)
+    assert ent._actual_valve_position == VALVE_OPEN_POSITION
+
+
+async def test_unchanged_resend_skips_recent_actual_repoll(hass_mock, cfg_defaults):
+    ent = SmartTRVClimate(hass_mock, "e_repoll", cfg_defaults)
+    ent._valve_position = 100
+    ent._actual_valve_positions = (80,)
+    ent._last_actual_poll_monotonic = time.monotonic()
+    hass_mock.states.get.return_value = MagicMock(state="heat")
+
+    with patch.object(ent, "_async_update_actual_valve_position") as mock_poll:
+        # Selective resend of the same command shortly after a readout: no re-poll
+        await ent._async_set_valve_position(100)
+        mock_poll.assert_not_called()
+
+        # A changed command always re-polls
+        await ent._async_set_valve_position(150)
+        mock_poll.assert_called_once()
+
+
+def test_ff_alpha_reused_for_steady_cadence(hass_mock, cfg_defaults):
+    import math
+
+    ent = SmartTRVClimate(hass_mock, "e_alpha", cfg_defaults)
+
+    a1 = ent._ff_alpha(60.0, 600.0)
+    assert a1 == pytest.approx(1.0 - math.exp(-0.1))
+    # Jitter within tolerance reuses the cached factor
+    assert ent._ff_alpha(60.3, 600.0) == a1
+    # A clearly different dt recomputes
+    assert ent._ff_alpha(120.0, 600.0) == pytest.approx(1.0 - math.exp(-0.2))
+
+
+def test_back_calculation_unwinds_saturated_integral(hass_mock, cfg_defaults):
+    ent = SmartTRVClimate(hass_mock, "e_aw", cfg_defaults)
+    # Integral alone already saturates the output
+    ent._i_accum = 2.0 / ent._integral_gain
+    before = ent._i_accum
+
+    ent._update_integral(norm_error=0.1, heat_side=True, cool_side=False, dt=60.0, u_ff=0.0)
+
+    assert ent._i_accum < before
+    # Unsaturated output integrates the error as before
+    ent._i_accum = 0.0
+    ent._update_integral(norm_error=0.01, heat_side=True, cool_side=False, dt=60.0, u_ff=0.0)
+    assert ent._i_accum == pytest.approx(0.01 * 60.0)
+
+
+async def test_control_tick_threads_single_timestamp(hass_mock, cfg_defaults):
+    """One control tick reads the clock once and stamps the valve send with that value."""
+    ent = SmartTRVClimate(hass_mock, "e_now", cfg_defaults)
+    ent._set_trv_entities([])
+    ent._hvac_mode = HVACMode.OFF
+    ent._valve_position = 100
+
+    with patch("custom_components.smart_trv.climate.time.monotonic", return_value=5000.0) as mono:
+        await ent._async_control_heating()
+
+    assert mono.call_count == 1
+    assert ent._last_valve_send_monotonic == 5000.0
+    assert ent._last_actual_poll_monotonic == 5000.0
+
+
+async def test_steady_command_returns_before_any_state_lookup(hass_mock, cfg_defaults):
+    ent = SmartTRVClimate(hass_mock, "e_steady", cfg_defaults)
+    ent._set_trv_entities(["climate.trv_a", "climate.trv_b"])
+    ent._valve_position = 100
+    ent._actual_valve_position = 100
+    ent._actual_valve_positions = (100, 100)
+    hass_mock.states.get.reset_mock()
+
+    with patch.object(ent, "_async_update_actual_valve_position") as mock_poll:
+        await ent._async_set_valve_position(100)
+
+    hass_mock.states.get.assert_not_called()
+    hass_mock.services.async_call.assert_not_called()
+    mock_poll.assert_not_called()
+
+
+async def test_number_entity_push_skips_climate_state_lookup(hass_mock, cfg_defaults):
+    ent = SmartTRVClimate(hass_mock, "e_num", cfg_defaults)
+    hass_mock.states.get.reset_mock()
+    hass_mock.states.get.return_value = MagicMock(state="40")
+
+    with patch.object(ent, "_async_update_actual_valve_position"):
+        await ent._async_set_valve_position(100)
+
+    hass_mock.states.get.assert_called_once_with("number.trv_valve_position")
+    hass_mock.services.async_call.assert_awaited_once()
+
+
+async def test_control_run_reads_clock_once(hass_mock, cfg_defaults):
+    ent = SmartTRVClimate(hass_mock, "e_clock", cfg_defaults)
+    _set_temp(ent, current=20.0, target=21.0)
+    ent.async_write_ha_state = MagicMock()
+
+    # Every clock read returns a new value, so shared timestamps prove a single read per tick
+    ticks = itertools.count(1000.0)
+    with patch("custom_components.smart_trv.climate.time.monotonic", side_effect=lambda: next(ticks)):
+        await ent._async_run_control_once()
+
+    assert ent._last_control_monotonic == ent._last_update_monotonic == ent._last_valve_send_monotonic
+
+
+async def test_single_push_awaited_without_gather(hass_mock, cfg_defaults):
+    ent = SmartTRVClimate(hass_mock, "e_single", cfg_defaults)
+    hass_mock.states.get.return_value = MagicMock(state="40")
+
+    with patch("custom_components.smart_trv.climate.asyncio.gather") as mock_gather, \
+         patch.object(ent, "_async_update_actual_valve_position"):
+        await ent._async_set_valve_position(100)
+
+    mock_gather.assert_not_called()
+    hass_mock.services.async_call.assert_awaited_once()
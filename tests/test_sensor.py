@@ -1,84 +1,54 @@
 """Tests for Smart TRV Setpoint Sensor."""
 from __future__ import annotations
 
+from collections.abc import Mapping
+from types import MappingProxyType, SimpleNamespace
+from typing import Any
 from unittest.mock import MagicMock
 
 import pytest
 
-from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, State
-
-from custom_components.smart_trv.sensor import SmartTRVSetpointSensor
+from custom_components.smart_trv.sensor import SmartTRVSetpointSensor, _to_float
 from custom_components.smart_trv.const import (
     ATTR_VALVE_POSITION,
     ATTR_ROOM_TEMPERATURE,
-    CONF_MAX_TEMP,
-    CONF_MIN_TEMP,
-    CONF_NAME,
     DEFAULT_MAX_TEMP,
     DEFAULT_MIN_TEMP,
     VALVE_OPEN_POSITION,
 )
 
-
-@pytest.fixture
-def hass() -> MagicMock:
-    hass = MagicMock(spec=HomeAssistant)
-    hass.states = MagicMock()
-    hass.async_create_task = MagicMock(side_effect=lambda coro: coro)
-    hass.data = {}
-    return hass
-
-
-@pytest.fixture
-def config_entry() -> MagicMock:
-    entry = MagicMock(spec=ConfigEntry)
-    entry.entry_id = "sensor_entry"
-    entry.data = {
-        CONF_NAME: "Test Smart TRV",
-        CONF_MIN_TEMP: DEFAULT_MIN_TEMP,
-        CONF_MAX_TEMP: DEFAULT_MAX_TEMP,
-    }
-    return entry
+# Half-open valve and the setpoint it maps to on the default 0–255 -> min..max scale
+_VALVE_POS_MID = 128
+_MID_VALVE_ATTRS = MappingProxyType({ATTR_VALVE_POSITION: _VALVE_POS_MID})
+_EXPECTED_MID_SETPOINT = DEFAULT_MIN_TEMP + (_VALVE_POS_MID / float(VALVE_OPEN_POSITION)) * (DEFAULT_MAX_TEMP - DEFAULT_MIN_TEMP)
 
 
-def _make_state(attrs: dict) -> MagicMock:
-    st = MagicMock(spec=State)
-    st.attributes = attrs
-    st.state = "unknown"
-    return st
+def _make_state(attrs: Mapping[str, Any]) -> SimpleNamespace:
+    """Return a minimal stand-in for a State; the sensors only read its attributes."""
+    return SimpleNamespace(state="unknown", attributes=attrs)
 
 
-@pytest.mark.asyncio
-async def test_sensor_native_value_from_valve(hass: MagicMock, config_entry: MagicMock):
-    """Sensor native value should map from valve position 0–255 to °C setpoint."""
+@pytest.fixture
+def sensor(hass: MagicMock, config_entry: SimpleNamespace) -> SmartTRVSetpointSensor:
+    """Create a setpoint sensor with state writes stubbed out and the climate entity resolved."""
     sensor = SmartTRVSetpointSensor(hass, config_entry)
     # Avoid touching HA internals
     sensor.async_write_ha_state = MagicMock()
     # Bypass registry resolution by setting climate entity id directly
     sensor._climate_entity_id = "climate.smart_trv_test"
+    return sensor
 
-    valve_pos = 128
-    attrs = {
-        ATTR_VALVE_POSITION: valve_pos,
-    }
-    hass.states.get.return_value = _make_state(attrs)
 
-    await sensor._update_from_climate_state()
+def test_sensor_native_value_from_valve(sensor: SmartTRVSetpointSensor):
+    """Sensor native value should map from valve position 0–255 to °C setpoint."""
+    sensor._recompute(_make_state(_MID_VALVE_ATTRS))
 
-    span = DEFAULT_MAX_TEMP - DEFAULT_MIN_TEMP
-    expected = DEFAULT_MIN_TEMP + (valve_pos / float(VALVE_OPEN_POSITION)) * span
     assert sensor.native_value is not None
-    assert abs(sensor.native_value - expected) < 1e-6
+    assert abs(sensor.native_value - _EXPECTED_MID_SETPOINT) < 1e-6
 
 
-@pytest.mark.asyncio
-async def test_sensor_attributes_include_target_error_and_valve(hass: MagicMock, config_entry: MagicMock):
+def test_sensor_attributes_include_target_error_and_valve(sensor: SmartTRVSetpointSensor):
     """Attributes should include target_temperature, error, and target_valve_position when available."""
-    sensor = SmartTRVSetpointSensor(hass, config_entry)
-    sensor.async_write_ha_state = MagicMock()
-    sensor._climate_entity_id = "climate.smart_trv_test"
-
     target = 22.0
     room = 20.5
     valve_pos = 200
@@ -87,9 +57,7 @@ async def test_sensor_attributes_include_target_error_and_valve(hass: MagicMock,
         "temperature": target,  # ATTR_TEMPERATURE string literal to avoid HA import here
         ATTR_ROOM_TEMPERATURE: room,
     }
-    hass.states.get.return_value = _make_state(attrs)
-
-    await sensor._update_from_climate_state()
+    sensor._recompute(_make_state(attrs))
 
     state_attrs = sensor.extra_state_attributes
     assert state_attrs["target_temperature"] == target
@@ -98,21 +66,14 @@ async def test_sensor_attributes_include_target_error_and_valve(hass: MagicMock,
     assert state_attrs["target_valve_position"] == valve_pos
 
 
-@pytest.mark.asyncio
-async def test_sensor_handles_missing_values(hass: MagicMock, config_entry: MagicMock):
+def test_sensor_handles_missing_values(sensor: SmartTRVSetpointSensor):
     """Sensor should handle missing valve or temps gracefully."""
-    sensor = SmartTRVSetpointSensor(hass, config_entry)
-    sensor.async_write_ha_state = MagicMock()
-    sensor._climate_entity_id = "climate.smart_trv_test"
-
     # Only target temperature present
     target = 21.0
     attrs = {
         "temperature": target,
     }
-    hass.states.get.return_value = _make_state(attrs)
-
-    await sensor._update_from_climate_state()
+    sensor._recompute(_make_state(attrs))
 
     # Native value unknown because valve missing
     assert sensor.native_value is None
@@ -122,3 +83,212 @@ async def test_sensor_handles_missing_values(hass: MagicMock, config_entry: Magi
     assert "error" not in state_attrs
     # No target valve position without valve
     assert "target_valve_position" not in state_attrs
+
+
+async def test_setup_entry_shares_one_climate_subscription(hass: MagicMock, config_entry: SimpleNamespace):
+    """All sensors of an entry are fed by a single state-change subscription."""
+    from unittest.mock import patch
+
+    from custom_components.smart_trv import sensor as sensor_mod
+
+    unsub = MagicMock()
+    added: list = []
+    with patch.object(sensor_mod, "_resolve_climate_entity_id", return_value="climate.smart_trv_test"), \
+            patch.object(sensor_mod, "async_track_state_change_event", return_value=unsub) as track:
+        await sensor_mod.async_setup_entry(hass, config_entry, lambda entities, *args: added.extend(entities))
+
+    track.assert_called_once()
+    assert track.call_args[0][1] == ["climate.smart_trv_test"]
+    config_entry.async_on_unload.assert_called_once()
+
+    # Register every sensor as HA would when adding it, then deliver one event
+    dispatcher = added[0]._dispatcher
+    for entity in added:
+        assert entity._dispatcher is dispatcher
+        entity._apply = MagicMock()
+        dispatcher.async_add(entity)
+    new_state = _make_state({ATTR_VALVE_POSITION: 10})
+    dispatcher._latest_state = new_state
+    dispatcher._async_dispatch_latest()
+
+    for entity in added:
+        entity._apply.assert_called_once_with(new_state)
+
+    # Unloading the entry drops the subscription
+    config_entry.async_on_unload.call_args[0][0]()
+    unsub.assert_called_once()
+
+
+def test_apply_recomputes_inline_and_writes_once(hass: MagicMock, sensor: SmartTRVSetpointSensor):
+    """A dispatched state change updates the sensor without scheduling a task."""
+    new_state = _make_state({ATTR_VALVE_POSITION: 0})
+
+    sensor._apply(new_state)
+
+    assert sensor.native_value == DEFAULT_MIN_TEMP
+    sensor.async_write_ha_state.assert_called_once()
+    hass.async_create_task.assert_not_called()
+    # The event's new_state is used as-is; no state machine lookup per sensor
+    hass.states.get.assert_not_called()
+
+
+def test_to_float_accepts_only_numbers():
+    """Attribute helper returns floats for int/float values (bools excluded) and None otherwise."""
+    class _Celsius(float):
+        pass
+
+    attrs = {"i": 3, "f": 2.5, "sub": _Celsius(19.5), "s": "4", "b": True, "n": None}
+    assert _to_float(attrs, "i") == 3.0
+    assert _to_float(attrs, "f") == 2.5
+    # Subclasses of int/float are numbers too; bool is the one exception
+    assert _to_float(attrs, "sub") == 19.5
+    assert _to_float(attrs, "s") is None
+    assert _to_float(attrs, "b") is None
+    assert _to_float(attrs, "n") is None
+    assert _to_float(attrs, "missing") is None
+
+
+def test_apply_skips_write_when_published_values_unchanged(sensor: SmartTRVSetpointSensor):
+    """Only state changes that move this sensor's value or attributes are written."""
+    sensor._apply(_make_state({ATTR_VALVE_POSITION: 100, "u_pi": 0.1}))
+    assert sensor.async_write_ha_state.call_count == 1
+
+    # Unrelated controller attribute moved: no write
+    sensor._apply(_make_state({ATTR_VALVE_POSITION: 100, "u_pi": 0.2}))
+    assert sensor.async_write_ha_state.call_count == 1
+
+    # Attribute-only change (room temperature) still publishes
+    sensor._apply(_make_state({ATTR_VALVE_POSITION: 100, ATTR_ROOM_TEMPERATURE: 20.0}))
+    assert sensor.async_write_ha_state.call_count == 2
+
+
+def test_extra_state_attributes_built_once_per_update(sensor: SmartTRVSetpointSensor):
+    """Reading the attributes returns the dict built by the last update."""
+    sensor._recompute(_make_state({ATTR_VALVE_POSITION: 50, "temperature": 21.0}))
+
+    first = sensor.extra_state_attributes
+    assert sensor.extra_state_attributes is first
+    assert first == {"target_temperature": 21.0, "target_valve_position": 50}
+
+    sensor._recompute(_make_state({}))
+    assert sensor.extra_state_attributes == {}
+
+
+async def test_dispatcher_coalesces_bursts_to_latest_state(hass: MagicMock):
+    """First event dispatches immediately; a burst within the cooldown yields one trailing dispatch."""
+    import asyncio
+
+    from custom_components.smart_trv.sensor import _ClimateStateDispatcher
+
+    loop = asyncio.get_running_loop()
+    hass.loop = loop
+    hass.async_create_task = MagicMock(side_effect=lambda coro, *args, **kwargs: loop.create_task(coro))
+    hass.async_run_hass_job = MagicMock(side_effect=lambda job, *args, **kwargs: job.target())
+
+    dispatcher = _ClimateStateDispatcher(hass, "climate.smart_trv_test")
+    # Shorten the cooldown so the trailing dispatch does not slow the suite down
+    dispatcher._debouncer.cooldown = 0.01
+    sensor = MagicMock()
+    sensor._watched_attributes.return_value = (ATTR_VALVE_POSITION,)
+    dispatcher.async_add(sensor)
+
+    def _event(valve: int) -> MagicMock:
+        event = MagicMock()
+        event.data = {"new_state": _make_state({ATTR_VALVE_POSITION: valve})}
+        return event
+
+    dispatcher._async_state_changed(_event(1))
+    await asyncio.sleep(0)
+    assert sensor._apply.call_count == 1
+
+    dispatcher._async_state_changed(_event(2))
+    dispatcher._async_state_changed(_event(3))
+    await asyncio.sleep(0)
+    assert sensor._apply.call_count == 1
+
+    await asyncio.sleep(0.05)
+    assert sensor._apply.call_count == 2
+    assert sensor._apply.call_args[0][0].attributes[ATTR_VALVE_POSITION] == 3
+
+    dispatcher._debouncer.async_shutdown()
+
+
+async def test_mirror_sensors_built_from_specs(hass: MagicMock, config_entry: SimpleNamespace):
+    """Diagnostic mirrors keep their unique ids, names and per-spec device class/unit."""
+    from unittest.mock import patch
+
+    from homeassistant.components.sensor import SensorDeviceClass
+    from homeassistant.const import UnitOfTemperature
+
+    from custom_components.smart_trv import sensor as sensor_mod
+
+    added: list = []
+    add_entities = MagicMock(side_effect=lambda entities, *args, **kwargs: added.extend(entities))
+    with patch.object(sensor_mod, "_resolve_climate_entity_id", return_value=None):
+        await sensor_mod.async_setup_entry(hass, config_entry, add_entities)
+
+    # No update_before_add round for entities without async_update
+    assert add_entities.call_args == ((added,), {})
+    assert len(added) == 17
+    by_uid = {e.unique_id: e for e in added}
+    flow = by_uid["smart_trv_test_entry_id_flow_filtered"]
+    assert flow.name == "Test Smart TRV Flow Temp (filtered)"
+    assert flow.device_class == SensorDeviceClass.TEMPERATURE
+    assert flow.native_unit_of_measurement == UnitOfTemperature.CELSIUS
+    kc = by_uid["smart_trv_test_entry_id_imc_kc"]
+    assert kc.device_class is None
+    assert kc.native_unit_of_measurement is None
+
+    kc._recompute(_make_state({"imc_kc": 2}))
+    assert kc.native_value == 2.0
+
+
+def test_sensor_state_uses_slots(hass: MagicMock, config_entry: SimpleNamespace):
+    """Own sensor state lives in slots while HA's entity attributes still work."""
+    sensor = SmartTRVSetpointSensor(hass, config_entry)
+
+    for name in ("_native_value", "_climate_entity_id", "_scale", "_attrs_cache"):
+        assert name not in vars(sensor)
+    # HA-managed attributes are still settable through the entity base
+    sensor.entity_id = "sensor.test_smart_trv_setpoint"
+    assert sensor.entity_id == "sensor.test_smart_trv_setpoint"
+    assert sensor.unique_id == "smart_trv_test_entry_id_setpoint"
+
+
+def test_dispatcher_only_updates_sensors_watching_changed_attributes(hass: MagicMock):
+    """After the first dispatch, only subscribers of attributes that changed are updated."""
+    from custom_components.smart_trv.sensor import _ClimateStateDispatcher
+
+    dispatcher = _ClimateStateDispatcher(hass, "climate.smart_trv_test")
+    valve = MagicMock()
+    valve._watched_attributes.return_value = (ATTR_VALVE_POSITION,)
+    room = MagicMock()
+    room._watched_attributes.return_value = (ATTR_ROOM_TEMPERATURE, ATTR_VALVE_POSITION)
+    dispatcher.async_add(valve)
+    remove_room = dispatcher.async_add(room)
+
+    def _dispatch(attrs: dict) -> None:
+        dispatcher._latest_state = _make_state(attrs)
+        dispatcher._async_dispatch_latest()
+
+    # First dispatch has no baseline: everyone is updated
+    _dispatch({ATTR_VALVE_POSITION: 10, ATTR_ROOM_TEMPERATURE: 20.0})
+    assert (valve._apply.call_count, room._apply.call_count) == (1, 1)
+
+    # Only the room temperature moved
+    _dispatch({ATTR_VALVE_POSITION: 10, ATTR_ROOM_TEMPERATURE: 20.5})
+    assert (valve._apply.call_count, room._apply.call_count) == (1, 2)
+
+    # Both watched attributes moved: the room sensor is still updated once
+    _dispatch({ATTR_VALVE_POSITION: 20, ATTR_ROOM_TEMPERATURE: 21.0})
+    assert (valve._apply.call_count, room._apply.call_count) == (2, 3)
+
+    # A removed attribute counts as changed
+    _dispatch({ATTR_VALVE_POSITION: 20})
+    assert (valve._apply.call_count, room._apply.call_count) == (2, 4)
+
+    # Unrelated attribute only: nobody is updated; unregistered sensors are skipped
+    remove_room()
+    _dispatch({ATTR_VALVE_POSITION: 20, "u_pi": 0.3})
+    _dispatch({ATTR_VALVE_POSITION: 30})
+    assert (valve._apply.call_count, room._apply.call_count) == (3, 4)